@@ -2,21 +2,47 @@
 
 from __future__ import annotations
 
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
-import voluptuous as vol
 from homeassistant.const import Platform
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import OversightApiClient
-from .const import CONF_HOST, CONF_PORT, DOMAIN, LOGGER
-from .coordinator import OversightDataUpdateCoordinator
+from .badges import OversightBadgeTracker
+from .const import (
+    CONF_DEBUG_TRACING,
+    CONF_FALLBACK_TARGETS,
+    CONF_HOST,
+    CONF_LEAN_MODE,
+    CONF_LIVENESS_INTERVAL,
+    CONF_PORT,
+    DATA_ANNOUNCEMENTS,
+    DATA_BADGES,
+    DATA_EVENTS,
+    DATA_MIRROR,
+    DATA_SCHEDULER,
+    DEFAULT_LIVENESS_INTERVAL,
+    DOMAIN,
+    LOGGER,
+)
+from .coordinator import OversightDataUpdateCoordinator, OversightLivenessCoordinator
 from .data import OversightData
+from .debug import disable_tracing, enable_tracing
+from .mirror import OversightBadgeMirror
+from .notifier import OversightNotifier
+from .scheduler import OversightScheduler
+from .services import async_register_services
+from .websocket_api import OversightEventHub, async_register_websocket_commands
+from .writer import OversightSettingsWriter
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant, ServiceCall
+    from collections.abc import Mapping
 
+    from homeassistant.core import HomeAssistant
+
+    from .config_flow import AnnouncementCache
     from .data import OversightConfigEntry
 
 PLATFORMS: list[Platform] = [
@@ -27,42 +53,117 @@ PLATFORMS: list[Platform] = [
     Platform.SWITCH,
 ]
 
+# Large fleets can leave out the CONFIG entities; settings stay reachable
+# through the configure service
+LEAN_PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.NOTIFY,
+]
+
+
+def _platforms(options: Mapping[str, Any]) -> list[Platform]:
+    """Return the platforms an entry sets up with the given options."""
+    return LEAN_PLATFORMS if options.get(CONF_LEAN_MODE) else PLATFORMS
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: OversightConfigEntry,
 ) -> bool:
     """Set up OverSight Android TV from a config entry."""
+    if entry.options.get(CONF_DEBUG_TRACING):
+        enable_tracing(entry.entry_id)
+        entry.async_on_unload(partial(disable_tracing, entry.entry_id))
+
     client = OversightApiClient(
         host=entry.data[CONF_HOST],
         port=int(entry.data[CONF_PORT]),
         session=async_get_clientsession(hass),
     )
 
+    liveness = OversightLivenessCoordinator(
+        hass=hass,
+        logger=LOGGER,
+        name=f"{DOMAIN}_{entry.unique_id}_liveness",
+        client=client,
+        interval=entry.options.get(CONF_LIVENESS_INTERVAL, DEFAULT_LIVENESS_INTERVAL),
+    )
     coordinator = OversightDataUpdateCoordinator(
         hass=hass,
         logger=LOGGER,
         name=f"{DOMAIN}_{entry.unique_id}",
         client=client,
+        liveness=liveness,
     )
 
+    await liveness.async_refresh()
     await coordinator.async_config_entry_first_refresh()
 
+    # Pick up state changes made while the device was away
+    entry.async_on_unload(
+        liveness.async_add_reconnect_listener(
+            lambda: hass.async_create_task(coordinator.async_request_refresh())
+        )
+    )
+
     entry.runtime_data = OversightData(
         client=client,
         coordinator=coordinator,
+        liveness=liveness,
+        notifier=OversightNotifier(
+            hass,
+            entry.entry_id,
+            client,
+            coordinator,
+            liveness,
+            entry.options.get(CONF_FALLBACK_TARGETS, []),
+        ),
+        writer=OversightSettingsWriter(hass, client, coordinator),
+        options=dict(entry.options),
     )
+    entry.async_on_unload(entry.runtime_data.writer.async_shutdown)
 
     # Store entry data for service lookups
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = entry.runtime_data
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    # The scheduler, badge tracker and mirror serve every entry and start with
+    # the first one
+    if DATA_SCHEDULER not in hass.data:
+        scheduler = hass.data[DATA_SCHEDULER] = OversightScheduler(hass)
+        badges = hass.data[DATA_BADGES] = OversightBadgeTracker(hass)
+        mirror = hass.data[DATA_MIRROR] = OversightBadgeMirror(hass)
+        await scheduler.async_load()
+        await badges.async_load()
+        await mirror.async_load()
+
+    # The event hub outlives its entries, so that subscriptions keep running
+    # while every device is reloaded
+    if DATA_EVENTS not in hass.data:
+        events = hass.data[DATA_EVENTS] = OversightEventHub(hass)
+        events.async_start()
+        async_register_websocket_commands(hass)
+    hass.data[DATA_MIRROR].async_refresh_entry(entry.entry_id)
+    entry.async_on_unload(hass.data[DATA_EVENTS].async_attach(entry))
+
+    # A device that was away may have rebooted and lost its badges
+    entry.async_on_unload(
+        liveness.async_add_reconnect_listener(
+            lambda: hass.async_create_task(
+                hass.data[DATA_BADGES].async_reapply(entry.runtime_data)
+            )
+        )
+    )
+
+    _async_update_lean_entities(hass, entry)
+    await hass.config_entries.async_forward_entry_setups(
+        entry, _platforms(entry.options)
+    )
+    entry.async_on_unload(entry.add_update_listener(async_entry_updated))
 
     # Register services once (first entry)
     if not hass.services.has_service(DOMAIN, "send_fixed_notification"):
-        _register_services(hass)
+        async_register_services(hass)
 
     return True
 
@@ -72,181 +173,88 @@ async def async_unload_entry(
     entry: OversightConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    result = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    # Unload what was set up, even if the options have changed since
+    result = await hass.config_entries.async_unload_platforms(
+        entry, _platforms(entry.runtime_data.options)
+    )
     if result:
         hass.data[DOMAIN].pop(entry.entry_id, None)
         if not hass.data[DOMAIN]:
             hass.data.pop(DOMAIN, None)
+            scheduler: OversightScheduler = hass.data.pop(DATA_SCHEDULER)
+            badges: OversightBadgeTracker = hass.data.pop(DATA_BADGES)
+            mirror: OversightBadgeMirror = hass.data.pop(DATA_MIRROR)
+            await scheduler.async_shutdown()
+            await badges.async_shutdown()
+            await mirror.async_shutdown()
     return result
 
 
-async def async_reload_entry(
+async def async_remove_entry(
     hass: HomeAssistant,
     entry: OversightConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Let discovery offer a removed device again."""
+    cache: AnnouncementCache | None = hass.data.get(DATA_ANNOUNCEMENTS)
+    if cache is not None and entry.unique_id is not None:
+        cache.by_device.pop(entry.unique_id, None)
 
 
-def _get_client_for_entity(
-    hass: HomeAssistant, entity_id: str
-) -> OversightApiClient | None:
-    """Resolve an entity_id to its OversightApiClient."""
+def _async_update_lean_entities(
+    hass: HomeAssistant,
+    entry: OversightConfigEntry,
+) -> bool:
+    """
+    Disable the entities lean mode leaves out, or enable them again.
+
+    Disabling keeps the entity ids and customizations of the CONFIG entities
+    for when lean mode is turned off. Entities the user disabled stay so.
+    Returns true if any entity was enabled, in which case Home Assistant
+    reloads the entry by itself once the registry has settled.
+    """
+    enabled = False
+    lean_mode = bool(entry.options.get(CONF_LEAN_MODE))
+    lean = {str(platform) for platform in LEAN_PLATFORMS}
     ent_reg = er.async_get(hass)
-    entry = ent_reg.async_get(entity_id)
-    if entry is None or entry.config_entry_id is None:
-        return None
-    data = hass.data.get(DOMAIN, {}).get(entry.config_entry_id)
-    if data is None:
-        return None
-    return data.client
-
-
-def _get_client_from_call(hass: HomeAssistant, call: ServiceCall) -> OversightApiClient:
-    """Get a client from a service call's entity target."""
-    entity_ids = call.data.get("entity_id", [])
-    if isinstance(entity_ids, str):
-        entity_ids = [entity_ids]
-
-    # Try entity targeting first
-    for eid in entity_ids:
-        client = _get_client_for_entity(hass, eid)
-        if client is not None:
-            return client
-
-    # Fallback: use first available entry
-    entries = hass.data.get(DOMAIN, {})
-    if entries:
-        first = next(iter(entries.values()))
-        return first.client
-
-    msg = "No OverSight devices configured"
-    raise ValueError(msg)
-
-
-def _register_services(hass: HomeAssistant) -> None:
-    """Register custom services for OverSight."""
-
-    async def handle_send_notification(call: ServiceCall) -> None:
-        """Handle the send_notification service call."""
-        client = _get_client_from_call(hass, call)
-        data: dict[str, Any] = {"message": call.data["message"]}
-        for field in (
-            "title",
-            "source",
-            "image",
-            "video",
-            "small_icon",
-            "small_icon_color",
-            "large_icon",
-            "corner",
-            "duration",
+    for registry_entry in er.async_entries_for_config_entry(ent_reg, entry.entry_id):
+        if registry_entry.domain in lean:
+            continue
+        if lean_mode and registry_entry.disabled_by is None:
+            ent_reg.async_update_entity(
+                registry_entry.entity_id,
+                disabled_by=er.RegistryEntryDisabler.INTEGRATION,
+            )
+        elif (
+            not lean_mode
+            and registry_entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
         ):
-            if field in call.data:
-                camel = _to_camel_case(field)
-                data[camel] = call.data[field]
-        await client.async_send_notification(data)
-
-    async def handle_send_fixed_notification(call: ServiceCall) -> None:
-        """Handle the send_fixed_notification service call."""
-        client = _get_client_from_call(hass, call)
-        data: dict[str, Any] = {"id": call.data["id"]}
-        for field in (
-            "icon",
-            "text",
-            "icon_color",
-            "message_color",
-            "background_color",
-            "border_color",
-            "shape",
-            "size",
-            "expiration",
-            "show_duration",
-            "collapse_duration",
-            "repeat_expand",
-        ):
-            if field in call.data:
-                # Convert snake_case to camelCase for the API
-                camel = _to_camel_case(field)
-                data[camel] = call.data[field]
-        await client.async_send_fixed_notification(data)
-
-    async def handle_remove_fixed_notification(call: ServiceCall) -> None:
-        """Handle the remove_fixed_notification service call."""
-        client = _get_client_from_call(hass, call)
-        await client.async_send_fixed_notification(
-            {"id": call.data["id"], "visible": False}
-        )
-
-    async def handle_screen_on(call: ServiceCall) -> None:
-        """Handle the screen_on service call."""
-        client = _get_client_from_call(hass, call)
-        await client.async_screen_on()
-
-    hass.services.async_register(
-        DOMAIN,
-        "send_notification",
-        handle_send_notification,
-        schema=vol.Schema(
-            {
-                vol.Required("message"): str,
-                vol.Optional("title"): str,
-                vol.Optional("source"): str,
-                vol.Optional("image"): str,
-                vol.Optional("video"): str,
-                vol.Optional("small_icon"): str,
-                vol.Optional("small_icon_color"): str,
-                vol.Optional("large_icon"): str,
-                vol.Optional("corner"): str,
-                vol.Optional("duration"): int,
-            },
-            extra=vol.ALLOW_EXTRA,
-        ),
-    )
-
-    hass.services.async_register(
-        DOMAIN,
-        "send_fixed_notification",
-        handle_send_fixed_notification,
-        schema=vol.Schema(
-            {
-                vol.Required("id"): str,
-                vol.Optional("icon"): str,
-                vol.Optional("text"): str,
-                vol.Optional("icon_color"): str,
-                vol.Optional("message_color"): str,
-                vol.Optional("background_color"): str,
-                vol.Optional("border_color"): str,
-                vol.Optional("shape"): str,
-                vol.Optional("size"): str,
-                vol.Optional("expiration"): str,
-                vol.Optional("show_duration"): int,
-                vol.Optional("collapse_duration"): int,
-                vol.Optional("repeat_expand"): bool,
-            },
-            extra=vol.ALLOW_EXTRA,
-        ),
-    )
-
-    hass.services.async_register(
-        DOMAIN,
-        "remove_fixed_notification",
-        handle_remove_fixed_notification,
-        schema=vol.Schema(
-            {vol.Required("id"): str},
-            extra=vol.ALLOW_EXTRA,
-        ),
-    )
-
-    hass.services.async_register(
-        DOMAIN,
-        "screen_on",
-        handle_screen_on,
-        schema=vol.Schema({}, extra=vol.ALLOW_EXTRA),
-    )
+            ent_reg.async_update_entity(registry_entry.entity_id, disabled_by=None)
+            enabled = True
+    return enabled
 
 
-def _to_camel_case(snake_str: str) -> str:
-    """Convert snake_case to camelCase."""
-    parts = snake_str.split("_")
-    return parts[0] + "".join(word.capitalize() for word in parts[1:])
+async def async_entry_updated(
+    hass: HomeAssistant,
+    entry: OversightConfigEntry,
+) -> None:
+    """Apply an entry update, in place if only the device address changed."""
+    data = entry.runtime_data
+    if dict(entry.options) != data.options:
+        # Enabling the entities lean mode left out already has the entry
+        # reloaded, with the new options; a reload of our own would be a
+        # second one
+        if data.options.get(CONF_LEAN_MODE) and _async_update_lean_entities(
+            hass, entry
+        ):
+            return
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    # DHCP moves come in through zeroconf; keep the entities and just follow
+    host = entry.data[CONF_HOST]
+    port = int(entry.data[CONF_PORT])
+    if not data.client.update_address(host, port):
+        return
+    LOGGER.info("Device %s moved to %s:%s", entry.title, host, port)
+    await data.liveness.async_refresh()
+    await data.coordinator.async_request_refresh()
@@ -3,11 +3,25 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import socket
+from dataclasses import dataclass
+from functools import partial
 from typing import Any
 
 import aiohttp
 import async_timeout
+import orjson
+
+from .debug import span
+
+# Badge sends issued within this window share one request
+BATCH_WINDOW = 0.005
+
+# Feature flag a device lists under "features" in /info to accept batches
+FEATURE_BATCH = "notify_fixed_batch"
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class OversightApiClientError(Exception):
@@ -18,6 +32,63 @@ class OversightApiClientCommunicationError(OversightApiClientError):
     """Exception to indicate a communication error."""
 
 
+@dataclass(slots=True)
+class OversightRequestStats:
+    """Counters a caller can pass in to learn how a request went."""
+
+    attempts: int = 0
+
+
+async def async_probe_port(host: str, port: int, connect_timeout: float) -> bool:
+    """Return true if a TCP connection to host:port opens in time."""
+    try:
+        async with async_timeout.timeout(connect_timeout):
+            _, writer = await asyncio.open_connection(host, port)
+    except (TimeoutError, OSError):
+        return False
+    writer.close()
+    with contextlib.suppress(OSError):
+        await writer.wait_closed()
+    return True
+
+
+# Request bodies may be passed in already encoded, e.g. once for a broadcast
+type Body = dict[str, Any] | bytes
+
+type _QueuedBadge = tuple[bytes, asyncio.Future[dict[str, Any]], OversightRequestStats]
+
+
+def encode_body(data: Body) -> bytes:
+    """Return the JSON request body for a payload."""
+    return data if isinstance(data, bytes) else orjson.dumps(data)
+
+
+def _resolve(
+    future: asyncio.Future[dict[str, Any]],
+    result: dict[str, Any] | None = None,
+    exception: Exception | None = None,
+) -> None:
+    """Resolve a caller's future unless it was cancelled meanwhile."""
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result or {})
+
+
+def _release_batch(batch: list[_QueuedBadge], task: asyncio.Task[None]) -> None:
+    """Fail the badge sends a flush task left unresolved when it ended."""
+    for _, future, _ in batch:
+        if future.done():
+            continue
+        if task.cancelled():
+            future.cancel()
+        else:
+            msg = f"Badge send did not complete: {task.exception()}"
+            future.set_exception(OversightApiClientError(msg))
+
+
 class OversightApiClient:
     """API client for OverSight Android TV devices."""
 
@@ -31,45 +102,188 @@ class OversightApiClient:
         self._host = host
         self._port = port
         self._session = session
+        self.supports_batch = False
+        self._fixed_queue: list[_QueuedBadge] = []
+        self._fixed_flush: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._info_request: asyncio.Task[dict[str, Any]] | None = None
+        self._info: dict[str, Any] | None = None
+        self._info_fetched = 0.0
+        # Bumped by every write, so /info results that may predate it are
+        # not cached
+        self._info_generation = 0
 
     @property
     def base_url(self) -> str:
         """Return the base URL for the device."""
         return f"http://{self._host}:{self._port}"
 
-    async def async_get_info(self) -> dict[str, Any]:
-        """Get device info and current state."""
-        return await self._api_wrapper("get", f"{self.base_url}/info")
+    def update_address(self, host: str, port: int) -> bool:
+        """Point the client at a new address. Return false if it is unchanged."""
+        if (host, port) == (self._host, self._port):
+            return False
+        self._host = host
+        self._port = port
+        self._invalidate_info()
+        return True
+
+    async def async_check_alive(self, connect_timeout: float) -> bool:
+        """Check that the device port accepts connections, without HTTP."""
+        return await async_probe_port(self._host, self._port, connect_timeout)
+
+    async def async_get_info(
+        self, retries: int = 2, max_age: float = 0
+    ) -> dict[str, Any]:
+        """
+        Get device info and current state.
+
+        Concurrent calls share one in-flight request, which runs with the
+        retries of the call that started it. With max_age set, a result
+        fetched at most that many seconds ago is returned without a request.
+        Writes through this client discard both.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            max_age
+            and self._info is not None
+            and loop.time() - self._info_fetched <= max_age
+        ):
+            return self._info
+        if self._info_request is None:
+            request = loop.create_task(self._async_fetch_info(retries))
+            request.add_done_callback(self._info_request_done)
+            self._info_request = request
+        # One caller giving up must not cancel the request for the others
+        return await asyncio.shield(self._info_request)
+
+    async def _async_fetch_info(self, retries: int) -> dict[str, Any]:
+        """Request /info and remember the result unless a write overlapped."""
+        generation = self._info_generation
+        info = await self._api_wrapper("get", f"{self.base_url}/info", retries=retries)
+        self.supports_batch = FEATURE_BATCH in (info.get("features") or ())
+        if generation == self._info_generation:
+            self._info = info
+            self._info_fetched = asyncio.get_running_loop().time()
+        return info
+
+    def _info_request_done(self, request: asyncio.Task[dict[str, Any]]) -> None:
+        """Forget a finished /info request."""
+        if self._info_request is request:
+            self._info_request = None
+        if not request.cancelled():
+            # Mark the error retrieved in case every caller gave up
+            request.exception()
+
+    def _invalidate_info(self) -> None:
+        """Make the next /info call fetch state that includes a write."""
+        self._info_generation += 1
+        self._info = None
+        # A request already on the wire may predate the write; let it finish
+        # for its callers, but do not hand it to new ones
+        self._info_request = None
 
     async def async_set_overlay(self, **kwargs: Any) -> dict[str, Any]:
         """Update overlay settings."""
-        return await self._api_wrapper(
-            "post", f"{self.base_url}/set/overlay", data=kwargs
-        )
+        return await self._async_write(f"{self.base_url}/set/overlay", kwargs)
 
     async def async_set_notifications(self, **kwargs: Any) -> dict[str, Any]:
         """Update notification settings."""
-        return await self._api_wrapper(
-            "post", f"{self.base_url}/set/notifications", data=kwargs
-        )
+        return await self._async_write(f"{self.base_url}/set/notifications", kwargs)
 
     async def async_set_settings(self, **kwargs: Any) -> dict[str, Any]:
         """Update general settings."""
-        return await self._api_wrapper(
-            "post", f"{self.base_url}/set/settings", data=kwargs
-        )
+        return await self._async_write(f"{self.base_url}/set/settings", kwargs)
 
-    async def async_send_notification(self, data: dict[str, Any]) -> dict[str, Any]:
+    async def async_send_notification(
+        self,
+        data: Body,
+        retries: int = 2,
+        stats: OversightRequestStats | None = None,
+    ) -> dict[str, Any]:
         """Send a popup notification."""
-        return await self._api_wrapper("post", f"{self.base_url}/notify", data=data)
+        return await self._api_wrapper(
+            "post", f"{self.base_url}/notify", data=data, retries=retries, stats=stats
+        )
 
     async def async_send_fixed_notification(
-        self, data: dict[str, Any]
+        self,
+        data: Body,
+        stats: OversightRequestStats | None = None,
     ) -> dict[str, Any]:
-        """Send a fixed notification (badge)."""
-        return await self._api_wrapper(
-            "post", f"{self.base_url}/notify_fixed", data=data
+        """
+        Send a fixed notification (badge).
+
+        Calls made within BATCH_WINDOW of each other are sent together, in
+        one request if the device supports it and otherwise back to back on
+        the same connection. Each caller still gets its own result or error.
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[dict[str, Any]] = loop.create_future()
+        self._fixed_queue.append(
+            (encode_body(data), future, stats or OversightRequestStats())
         )
+        if self._fixed_flush is None:
+            self._fixed_flush = loop.call_later(BATCH_WINDOW, self._flush_fixed)
+        return await future
+
+    def _flush_fixed(self) -> None:
+        """Hand the queued badge sends to a task."""
+        self._fixed_flush = None
+        batch, self._fixed_queue = self._fixed_queue, []
+        task = asyncio.get_running_loop().create_task(self._async_send_fixed(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(partial(_release_batch, batch))
+
+    async def _async_send_fixed(self, batch: list[_QueuedBadge]) -> None:
+        """Deliver queued badge sends and resolve each caller's future."""
+        if len(batch) > 1 and self.supports_batch:
+            await self._async_send_fixed_batch(batch)
+            return
+        for index, (body, future, stats) in enumerate(batch):
+            if future.done():
+                continue
+            try:
+                result = await self._api_wrapper(
+                    "post", f"{self.base_url}/notify_fixed", data=body, stats=stats
+                )
+            except OversightApiClientCommunicationError as exception:
+                # The device is unreachable; do not run the retry loop for
+                # every badge still waiting behind this one
+                for _, pending, _ in batch[index:]:
+                    _resolve(pending, exception=exception)
+                return
+            except OversightApiClientError as exception:
+                _resolve(future, exception=exception)
+            else:
+                _resolve(future, result)
+
+    async def _async_send_fixed_batch(self, batch: list[_QueuedBadge]) -> None:
+        """Deliver several badge sends in a single request."""
+        stats = OversightRequestStats()
+        try:
+            result = await self._api_wrapper(
+                "post",
+                f"{self.base_url}/notify_fixed/batch",
+                # Splice the encoded badges instead of encoding them again
+                data=b'{"notifications":[' + b",".join(b for b, _, _ in batch) + b"]}",
+                stats=stats,
+            )
+        except OversightApiClientError as exception:
+            for _, future, item_stats in batch:
+                item_stats.attempts = stats.attempts
+                _resolve(future, exception=exception)
+            return
+
+        results = result.get("results") or []
+        for index, (_, future, item_stats) in enumerate(batch):
+            item_stats.attempts = stats.attempts
+            item = results[index] if index < len(results) else {}
+            if item.get("success", False):
+                _resolve(future, item.get("result", {}))
+            else:
+                msg = item.get("message", "Unknown API error")
+                _resolve(future, exception=OversightApiClientError(msg))
 
     async def async_get_fixed_notifications(self) -> dict[str, Any]:
         """Get active fixed notifications."""
@@ -79,49 +293,96 @@ class OversightApiClient:
         """Wake the device screen."""
         return await self._api_wrapper("post", f"{self.base_url}/screen_on")
 
+    async def async_wake_and_notify(
+        self,
+        data: Body,
+        *,
+        probe: bool = False,
+        stats: OversightRequestStats | None = None,
+    ) -> dict[str, Any]:
+        """
+        Wake the screen and show a popup back to back.
+
+        Both requests go out on the same keep-alive connection with no retry
+        delay in between. A failed wake does not hold back the popup. With
+        probe set, a fresh /info round trip made after the wake, never one
+        shared with a poll that started earlier, waits until the device
+        answers. A probe that still fails does not hold back the popup
+        either; the popup is sent with its own retries and its error is the
+        one raised.
+        """
+        with contextlib.suppress(OversightApiClientError):
+            await self._api_wrapper("post", f"{self.base_url}/screen_on", retries=0)
+        if probe:
+            with contextlib.suppress(OversightApiClientError):
+                await self._api_wrapper("get", f"{self.base_url}/info")
+        return await self.async_send_notification(data, stats=stats)
+
     async def async_restart_service(self) -> dict[str, Any]:
         """Restart the overlay service."""
-        return await self._api_wrapper("post", f"{self.base_url}/restart_service")
+        return await self._async_write(f"{self.base_url}/restart_service")
+
+    async def _async_write(
+        self, url: str, data: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Send a request that changes device state."""
+        # Invalidate on both sides: reads that start while the write is on
+        # the wire may still see the old state
+        self._invalidate_info()
+        try:
+            return await self._api_wrapper("post", url, data=data)
+        finally:
+            self._invalidate_info()
 
     async def _api_wrapper(
         self,
         method: str,
         url: str,
-        data: dict | None = None,
+        data: Body | None = None,
         retries: int = 2,
+        stats: OversightRequestStats | None = None,
     ) -> dict[str, Any]:
         """Wrap API calls with error handling and retry on connection errors."""
-        last_exception: Exception | None = None
-        for attempt in range(1 + retries):
-            try:
-                async with async_timeout.timeout(10):
-                    response = await self._session.request(
-                        method=method,
-                        url=url,
-                        json=data,
+        with span(method, url):
+            body = None if data is None else encode_body(data)
+            last_exception: Exception | None = None
+            for attempt in range(1 + retries):
+                if stats is not None:
+                    stats.attempts = attempt + 1
+                try:
+                    async with async_timeout.timeout(10):
+                        response = await self._session.request(
+                            method=method,
+                            url=url,
+                            data=body,
+                            headers=_JSON_HEADERS if body is not None else None,
+                        )
+                        response.raise_for_status()
+                        resp_json = orjson.loads(await response.read())
+                except (
+                    TimeoutError,
+                    aiohttp.ClientError,
+                    socket.gaierror,
+                ) as exception:
+                    last_exception = exception
+                    if attempt < retries:
+                        await asyncio.sleep(1)
+                        continue
+                except Exception as exception:
+                    msg = (
+                        "Unexpected error communicating with OverSight device - "
+                        f"{exception}"
                     )
-                    response.raise_for_status()
-                    resp_json = await response.json()
-            except (TimeoutError, aiohttp.ClientError, socket.gaierror) as exception:
-                last_exception = exception
-                if attempt < retries:
-                    await asyncio.sleep(1)
-                    continue
-            except Exception as exception:
-                msg = (
-                    "Unexpected error communicating with OverSight device - "
-                    f"{exception}"
-                )
-                raise OversightApiClientError(msg) from exception
-            else:
-                if not resp_json.get("success", False):
-                    msg = resp_json.get("message", "Unknown API error")
-                    raise OversightApiClientError(msg)
+                    raise OversightApiClientError(msg) from exception
+                else:
+                    if not resp_json.get("success", False):
+                        msg = resp_json.get("message", "Unknown API error")
+                        raise OversightApiClientError(msg)
 
-                return resp_json.get("result", {})
+                    return resp_json.get("result", {})
 
-        msg = (
-            "Error communicating with OverSight device at "
-            f"{self._host}:{self._port} - {last_exception}"
-        )
-        raise OversightApiClientCommunicationError(msg) from last_exception
+            msg = (
+                "Error communicating with OverSight device at "
+                f"{self._host}:{self._port} - {last_exception}"
+            )
+            raise OversightApiClientCommunicationError(msg) from last_exception
@@ -0,0 +1,222 @@
+"""Home Assistant side bookkeeping of fixed notifications (badges)."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import OversightApiClientError
+from .const import DOMAIN, LOGGER
+from .scheduler import NOT_LOADED_RETRY, SAVE_DELAY, DeadlineHeap
+
+if TYPE_CHECKING:
+    from .data import OversightData
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.badges"
+
+_RELATIVE_EXPIRATION = re.compile(r"^\s*(\d+)\s*([smhd])\s*$", re.IGNORECASE)
+_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+type BadgeKey = tuple[str, str]
+
+
+def parse_expiration(value: Any, now: datetime) -> datetime | None:
+    """
+    Turn a badge expiration into an absolute UTC time.
+
+    Accepts the relative forms the device understands ("90s", "30m", "2h",
+    "1d") and ISO timestamps. Returns None when the value is not understood.
+    """
+    if not isinstance(value, str):
+        return None
+    if match := _RELATIVE_EXPIRATION.match(value):
+        unit = _UNITS[match.group(2).lower()]
+        return now + timedelta(**{unit: int(match.group(1))})
+    if (parsed := dt_util.parse_datetime(value)) is not None:
+        return dt_util.as_utc(parsed)
+    return None
+
+
+@dataclass(slots=True)
+class TrackedBadge:
+    """A badge believed to be showing on a device."""
+
+    entry_id: str
+    payload: dict[str, Any]
+    expires: datetime | None
+
+    @property
+    def key(self) -> BadgeKey:
+        """Return the tracking key."""
+        return (self.entry_id, self.payload["id"])
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "entry_id": self.entry_id,
+            "payload": self.payload,
+            "expires": self.expires.isoformat() if self.expires else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TrackedBadge | None:
+        """Restore a stored badge, returning None if it is malformed."""
+        payload = data.get("payload") or {}
+        if "id" not in payload or "entry_id" not in data:
+            return None
+        expires = dt_util.parse_datetime(data.get("expires") or "")
+        return cls(
+            entry_id=data["entry_id"],
+            payload=payload,
+            expires=dt_util.as_utc(expires) if expires else None,
+        )
+
+
+class OversightBadgeTracker:
+    """
+    Track the badges sent to every device and expire them from one timer.
+
+    Expired badges are removed from the device explicitly, and live badges are
+    pushed again when a device comes back after being unreachable, since a
+    rebooted TV forgets them.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the tracker."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._badges: dict[BadgeKey, TrackedBadge] = {}
+        self._heap: DeadlineHeap[BadgeKey] = DeadlineHeap(hass, self._async_on_due)
+
+    async def async_load(self) -> None:
+        """Restore tracked badges from storage."""
+        data = await self._store.async_load() or {}
+        now = dt_util.utcnow()
+        for raw in data.get("badges", []):
+            badge = TrackedBadge.from_dict(raw)
+            if badge is None or badge.key in self._badges:
+                continue
+            if self._hass.config_entries.async_get_entry(badge.entry_id) is None:
+                continue
+            if badge.expires is not None and badge.expires <= now:
+                # Let the sweeper remove it right away
+                badge.expires = now
+            self._async_add(badge)
+
+    async def async_shutdown(self) -> None:
+        """Stop the timer and flush tracked badges to storage."""
+        self._heap.async_shutdown()
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_track(self, entry_id: str, payload: dict[str, Any]) -> None:
+        """Record a payload that was just sent to a device."""
+        key = (entry_id, payload["id"])
+        if payload.get("visible", True) is False:
+            if self._badges.pop(key, None) is not None:
+                self._heap.async_discard(key)
+                self._async_save()
+            return
+
+        # Updates may omit fields, so layer them over what was sent before
+        previous = self._badges.get(key)
+        merged = {**previous.payload, **payload} if previous else dict(payload)
+        if "expiration" in payload:
+            expires = parse_expiration(payload["expiration"], dt_util.utcnow())
+        else:
+            expires = previous.expires if previous else None
+        self._async_add(
+            TrackedBadge(entry_id=entry_id, payload=merged, expires=expires)
+        )
+        self._async_save()
+
+    async def async_reapply(self, data: OversightData) -> None:
+        """
+        Push every unexpired badge of an entry to its device again.
+
+        The badges go out at once, so that the client batches them, and one
+        that fails does not hold back the others.
+        """
+        now = dt_util.utcnow()
+        entry_id = data.notifier.entry_id
+        payloads: list[dict[str, Any]] = []
+        for badge in self._badges.values():
+            if badge.entry_id != entry_id:
+                continue
+            payload = dict(badge.payload)
+            if badge.expires is not None:
+                remaining = (badge.expires - now).total_seconds()
+                if remaining <= 0:
+                    continue
+                payload["expiration"] = f"{math.ceil(remaining / 60)}m"
+            payloads.append(payload)
+        results = await asyncio.gather(
+            *(data.client.async_send_fixed_notification(p) for p in payloads),
+            return_exceptions=True,
+        )
+        for payload, result in zip(payloads, results, strict=True):
+            if isinstance(result, OversightApiClientError):
+                LOGGER.debug("Could not re-apply badge %s: %s", payload["id"], result)
+            elif isinstance(result, BaseException):
+                raise result
+
+    @callback
+    def _async_add(self, badge: TrackedBadge) -> None:
+        """Track a badge and push its expiry, if it has one."""
+        self._badges[badge.key] = badge
+        if badge.expires is None:
+            self._heap.async_discard(badge.key)
+        else:
+            self._heap.async_push(badge.key, badge.expires)
+
+    @callback
+    def _async_save(self) -> None:
+        """Schedule a coalesced write to storage."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"badges": [badge.as_dict() for badge in self._badges.values()]}
+
+    @callback
+    def _async_on_due(self, key: BadgeKey) -> None:
+        """Remove an expired badge from its device."""
+        if (badge := self._badges.get(key)) is None:
+            return
+
+        entry_id, badge_id = key
+        data: OversightData | None = self._hass.data.get(DOMAIN, {}).get(entry_id)
+        if data is None:
+            entry = self._hass.config_entries.async_get_entry(entry_id)
+            if entry is not None and entry.disabled_by is None:
+                # The entry is still setting up, e.g. right after a restart;
+                # keep the badge until its removal can be sent
+                badge.expires = dt_util.utcnow() + NOT_LOADED_RETRY
+                self._heap.async_push(key, badge.expires)
+                return
+
+        del self._badges[key]
+        self._async_save()
+        if data is None:
+            return
+        self._hass.async_create_background_task(
+            self._async_remove(data, badge_id),
+            name=f"{DOMAIN} expire badge {badge_id}",
+        )
+
+    async def _async_remove(self, data: OversightData, badge_id: str) -> None:
+        """Send the removal for an expired badge."""
+        try:
+            await data.notifier.async_remove_fixed_notification(badge_id)
+        except OversightApiClientError as exception:
+            LOGGER.debug("Could not remove expired badge %s: %s", badge_id, exception)
@@ -14,8 +14,13 @@ from .entity import OversightEntity
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity import EntityDescription
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .coordinator import (
+        OversightDataUpdateCoordinator,
+        OversightLivenessCoordinator,
+    )
     from .data import OversightConfigEntry
 
 ENTITY_DESCRIPTIONS = (
@@ -35,6 +40,7 @@ async def async_setup_entry(
     async_add_entities(
         OversightConnectivitySensor(
             coordinator=entry.runtime_data.coordinator,
+            liveness=entry.runtime_data.liveness,
             entity_description=entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
@@ -42,9 +48,35 @@ async def async_setup_entry(
 
 
 class OversightConnectivitySensor(OversightEntity, BinarySensorEntity):
-    """Connectivity sensor for an OverSight device."""
+    """
+    Connectivity sensor for an OverSight device.
+
+    Driven by the liveness probe rather than the slower /info poll.
+    """
+
+    def __init__(
+        self,
+        coordinator: OversightDataUpdateCoordinator,
+        liveness: OversightLivenessCoordinator,
+        entity_description: EntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, entity_description)
+        self._liveness = liveness
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to liveness updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._liveness.async_add_listener(self._handle_coordinator_update)
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return true; an unreachable device is reported as off."""
+        return True
 
     @property
     def is_on(self) -> bool:
         """Return true if the device is reachable."""
-        return self.coordinator.last_update_success
+        return bool(self._liveness.data)
@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import ipaddress
+import time
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
+import async_timeout
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.components import network
+from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.aiohttp_client import (
+    async_create_clientsession,
+    async_get_clientsession,
+)
 
 if TYPE_CHECKING:
     from homeassistant.components.zeroconf import ZeroconfServiceInfo
@@ -16,8 +26,96 @@ from .api import (
     OversightApiClient,
     OversightApiClientCommunicationError,
     OversightApiClientError,
+    async_probe_port,
+)
+from .const import (
+    CONF_DEBUG_TRACING,
+    CONF_DEVICE_ID,
+    CONF_DEVICE_NAME,
+    CONF_FALLBACK_TARGETS,
+    CONF_HOST,
+    CONF_LEAN_MODE,
+    CONF_LIVENESS_INTERVAL,
+    CONF_PORT,
+    DATA_ANNOUNCEMENTS,
+    DEFAULT_LIVENESS_INTERVAL,
+    DEFAULT_PORT,
+    DOMAIN,
 )
-from .const import CONF_HOST, CONF_PORT, DEFAULT_PORT, DOMAIN
+
+CONF_NETWORK = "network"
+CONF_DEVICES = "devices"
+
+DEFAULT_NAME = "OverSight Device"
+
+# Flow source of the further devices picked from one subnet scan
+SOURCE_SCAN_ADOPT = "scan_adopt"
+
+# Subnet scan tuning: a /22 is 1022 hosts, so with these settings it takes
+# four rounds of connect attempts plus the /info calls of the responders.
+SCAN_CONCURRENCY = 256
+SCAN_CONNECT_TIMEOUT = 0.5
+SCAN_INFO_TIMEOUT = 3
+SCAN_MAX_HOSTS = 4096
+
+# Devices without a deviceId TXT record are asked over HTTP at most this often
+PROBE_INTERVAL = 600
+
+
+def _device_name(info: dict[str, Any], default: str = DEFAULT_NAME) -> str:
+    """Return the device name reported by /info."""
+    return (info.get("settings") or {}).get("deviceName", default)
+
+
+@dataclass(slots=True)
+class ScannedDevice:
+    """A device that answered a subnet scan."""
+
+    device_id: str
+    host: str
+    port: int
+    name: str
+
+
+@dataclass(slots=True, frozen=True)
+class Announcement:
+    """What a zeroconf announcement of a configured device said."""
+
+    host: str
+    port: int
+    version: str | None
+
+
+@dataclass(slots=True)
+class AnnouncementCache:
+    """Recent zeroconf announcements, shared by every discovery flow."""
+
+    by_device: dict[str, Announcement] = field(default_factory=dict)
+    # Device ids learned over HTTP, by address, with the time of the request;
+    # oldest first
+    probed: dict[tuple[str, int], tuple[str, float]] = field(default_factory=dict)
+
+    def probed_device_id(self, host: str, port: int) -> str | None:
+        """Return the device id last probed at an address, if recent enough."""
+        if (probed := self.probed.get((host, port))) is None:
+            return None
+        device_id, probed_at = probed
+        if time.monotonic() - probed_at > PROBE_INTERVAL:
+            del self.probed[(host, port)]
+            return None
+        return device_id
+
+    def add_probed(self, host: str, port: int, device_id: str) -> None:
+        """Remember the device id probed at an address, dropping expired ones."""
+        now = time.monotonic()
+        # Addresses that stopped announcing would otherwise stay forever
+        while self.probed:
+            address, (_, probed_at) = next(iter(self.probed.items()))
+            if now - probed_at <= PROBE_INTERVAL:
+                break
+            del self.probed[address]
+        self.probed.pop((host, port), None)
+        self.probed[(host, port)] = (device_id, now)
 
 
 class OversightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -31,8 +129,24 @@ class OversightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._discovered_port: int | None = None
         self._discovered_name: str | None = None
         self._discovered_device_id: str | None = None
+        self._scanned: dict[str, ScannedDevice] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> OversightOptionsFlow:
+        """Get the options flow for this handler."""
+        return OversightOptionsFlow()
 
     async def async_step_user(
+        self,
+        user_input: dict[str, Any] | None = None,  # noqa: ARG002
+    ) -> config_entries.ConfigFlowResult:
+        """Let the user enter a device or scan for one."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan"])
+
+    async def async_step_manual(
         self,
         user_input: dict[str, Any] | None = None,
     ) -> config_entries.ConfigFlowResult:
@@ -50,13 +164,10 @@ class OversightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown"
             else:
                 device_id = info.get("deviceId", "")
-                device_name = (info.get("settings") or {}).get(
-                    "deviceName", "OverSight Device"
-                )
                 await self.async_set_unique_id(device_id)
                 self._abort_if_unique_id_configured()
                 return self.async_create_entry(
-                    title=device_name,
+                    title=_device_name(info),
                     data={
                         CONF_HOST: host,
                         CONF_PORT: int(port),
@@ -64,7 +175,7 @@ class OversightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=vol.Schema(
                 {
                     vol.Required(
@@ -90,37 +201,201 @@ class OversightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_scan(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Scan a network range for devices that mDNS does not reach."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            port = int(user_input[CONF_PORT])
+            try:
+                subnet = ipaddress.ip_network(user_input[CONF_NETWORK], strict=False)
+            except ValueError:
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                if subnet.num_addresses > SCAN_MAX_HOSTS:
+                    errors[CONF_NETWORK] = "network_too_large"
+                else:
+                    self._scanned = await self._async_scan(subnet, port)
+                    if self._scanned:
+                        return await self.async_step_scan_select()
+                    errors["base"] = "no_devices_found"
+
+        default_network = (user_input or {}).get(CONF_NETWORK)
+        if default_network is None:
+            default_network = await self._async_default_network()
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_NETWORK,
+                        default=default_network or vol.UNDEFINED,
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_PORT,
+                        default=(user_input or {}).get(CONF_PORT, DEFAULT_PORT),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=65535,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                },
+            ),
+            errors=errors,
+        )
+
+    async def async_step_scan_select(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Pick which of the scanned devices to add."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            chosen = [
+                self._scanned[device_id] for device_id in user_input[CONF_DEVICES]
+            ]
+            if chosen:
+                first, *others = chosen
+                # Every further device gets its own flow and config entry
+                for device in others:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": SOURCE_SCAN_ADOPT},
+                            data={
+                                CONF_HOST: device.host,
+                                CONF_PORT: device.port,
+                                CONF_DEVICE_ID: device.device_id,
+                                CONF_DEVICE_NAME: device.name,
+                            },
+                        )
+                    )
+                await self.async_set_unique_id(first.device_id)
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=first.name,
+                    data={CONF_HOST: first.host, CONF_PORT: first.port},
+                )
+            errors["base"] = "no_devices_selected"
+
+        return self.async_show_form(
+            step_id="scan_select",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_DEVICES, default=list(self._scanned)
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(
+                                    value=device.device_id,
+                                    label=f"{device.name} ({device.host})",
+                                )
+                                for device in self._scanned.values()
+                            ],
+                            multiple=True,
+                            mode=selector.SelectSelectorMode.LIST,
+                        ),
+                    ),
+                },
+            ),
+            description_placeholders={"count": str(len(self._scanned))},
+            errors=errors,
+        )
+
+    async def async_step_scan_adopt(
+        self,
+        device: dict[str, Any],
+    ) -> config_entries.ConfigFlowResult:
+        """Add a device picked from a subnet scan."""
+        await self.async_set_unique_id(device[CONF_DEVICE_ID])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=device[CONF_DEVICE_NAME],
+            data={
+                CONF_HOST: device[CONF_HOST],
+                CONF_PORT: device[CONF_PORT],
+            },
+        )
+
     async def async_step_zeroconf(
         self,
         discovery_info: ZeroconfServiceInfo,
     ) -> config_entries.ConfigFlowResult:
-        """Handle zeroconf discovery of an OverSight device."""
+        """
+        Handle zeroconf discovery of an OverSight device.
+
+        Devices announce their id, name and a state version in TXT records.
+        A rediscovery that repeats the last announcement of a configured
+        device is dropped without any I/O, and a new state version refreshes
+        that device's coordinator.
+        """
         host = str(discovery_info.host)
         port = discovery_info.port or DEFAULT_PORT
 
         # Extract device info from mDNS TXT records
         properties = discovery_info.properties or {}
         device_id = properties.get("deviceId", "")
-        device_name = properties.get(
-            "deviceName", discovery_info.name or "OverSight Device"
+        device_name = properties.get("deviceName", discovery_info.name or DEFAULT_NAME)
+        version = properties.get("stateVersion")
+        cache: AnnouncementCache = self.hass.data.setdefault(
+            DATA_ANNOUNCEMENTS, AnnouncementCache()
         )
 
         if not device_id:
-            # Try to get deviceId from the API if not in TXT records
+            device_id = cache.probed_device_id(host, port) or ""
+        if not device_id:
+            # Older apps leave deviceId out of the TXT records
             try:
                 info = await self._test_connection(host, port)
-                device_id = info.get("deviceId", "")
-                device_name = (info.get("settings") or {}).get(
-                    "deviceName", device_name
-                )
             except OversightApiClientError:
                 return self.async_abort(reason="connection")
+            device_id = info.get("deviceId", "")
+            device_name = _device_name(info, device_name)
+            cache.add_probed(host, port, device_id)
 
         if not device_id:
             return self.async_abort(reason="unknown")
 
+        announcement = Announcement(host, port, version)
+        previous = cache.by_device.get(device_id)
+        if announcement == previous:
+            return self.async_abort(reason="already_configured")
+        entry = self.hass.config_entries.async_entry_for_domain_unique_id(
+            DOMAIN, device_id
+        )
+        if entry is not None:
+            cache.by_device[device_id] = announcement
+            if (
+                previous is not None
+                and version != previous.version
+                and entry.state is config_entries.ConfigEntryState.LOADED
+            ):
+                self.hass.async_create_task(
+                    entry.runtime_data.coordinator.async_request_refresh()
+                )
+
         await self.async_set_unique_id(device_id)
-        self._abort_if_unique_id_configured(updates={CONF_HOST: host, CONF_PORT: port})
+        # The update listener of a loaded entry follows address changes without
+        # a reload; an entry waiting to retry setup needs one to try the new
+        # address right away
+        self._abort_if_unique_id_configured(
+            updates={CONF_HOST: host, CONF_PORT: port},
+            reload_on_update=(
+                entry is None
+                or entry.state is not config_entries.ConfigEntryState.LOADED
+            ),
+        )
 
         self._discovered_host = host
         self._discovered_port = port
@@ -137,7 +412,7 @@ class OversightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Confirm zeroconf discovery."""
         if user_input is not None:
             return self.async_create_entry(
-                title=self._discovered_name or "OverSight Device",
+                title=self._discovered_name or DEFAULT_NAME,
                 data={
                     CONF_HOST: self._discovered_host,
                     CONF_PORT: self._discovered_port,
@@ -157,3 +432,103 @@ class OversightConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             session=async_create_clientsession(self.hass),
         )
         return await client.async_get_info()
+
+    async def _async_default_network(self) -> str | None:
+        """
+        Return the IPv4 subnet of the Home Assistant host, at most a /24.
+
+        The default adapter is preferred. IPv6 subnets are far too large to
+        scan, so a host without an IPv4 address gets no default.
+        """
+        adapters = await network.async_get_adapters(self.hass)
+        for adapter in sorted(adapters, key=lambda adapter: not adapter["default"]):
+            if not adapter["enabled"]:
+                continue
+            for ipv4 in adapter["ipv4"]:
+                if ipaddress.ip_address(ipv4["address"]).is_loopback:
+                    continue
+                prefix = max(ipv4["network_prefix"], 24)
+                return str(
+                    ipaddress.ip_network(f"{ipv4['address']}/{prefix}", strict=False)
+                )
+        return None
+
+    async def _async_scan(
+        self,
+        subnet: ipaddress.IPv4Network | ipaddress.IPv6Network,
+        port: int,
+    ) -> dict[str, ScannedDevice]:
+        """Probe every host of a subnet and return the new devices by id."""
+        session = async_get_clientsession(self.hass)
+        semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+
+        async def probe(host: str) -> ScannedDevice | None:
+            async with semaphore:
+                if not await async_probe_port(host, port, SCAN_CONNECT_TIMEOUT):
+                    return None
+                client = OversightApiClient(host=host, port=port, session=session)
+                try:
+                    async with async_timeout.timeout(SCAN_INFO_TIMEOUT):
+                        info = await client.async_get_info(retries=0)
+                except (TimeoutError, OversightApiClientError):
+                    return None
+            if not (device_id := info.get("deviceId")):
+                return None
+            return ScannedDevice(device_id, host, port, _device_name(info))
+
+        results = await asyncio.gather(*(probe(str(ip)) for ip in subnet.hosts()))
+        configured = self._async_current_ids()
+        found: dict[str, ScannedDevice] = {}
+        for device in results:
+            # A TV on several interfaces answers once per address
+            if device is not None and device.device_id not in configured:
+                found.setdefault(device.device_id, device)
+        return found
+
+
+class OversightOptionsFlow(config_entries.OptionsFlow):
+    """Options flow for OverSight Android TV."""
+
+    async def async_step_init(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_LIVENESS_INTERVAL,
+                        default=options.get(
+                            CONF_LIVENESS_INTERVAL, DEFAULT_LIVENESS_INTERVAL
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=300,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_FALLBACK_TARGETS,
+                        default=options.get(CONF_FALLBACK_TARGETS, []),
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="notify", multiple=True),
+                    ),
+                    vol.Optional(
+                        CONF_LEAN_MODE,
+                        default=options.get(CONF_LEAN_MODE, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_DEBUG_TRACING,
+                        default=options.get(CONF_DEBUG_TRACING, False),
+                    ): selector.BooleanSelector(),
+                },
+            ),
+        )
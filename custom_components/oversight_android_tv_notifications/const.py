@@ -10,6 +10,35 @@ CONF_HOST = "host"
 CONF_PORT = "port"
 CONF_DEVICE_ID = "device_id"
 CONF_DEVICE_NAME = "device_name"
+CONF_LIVENESS_INTERVAL = "liveness_interval"
+CONF_FALLBACK_TARGETS = "fallback_targets"
+CONF_DEBUG_TRACING = "debug_tracing"
+CONF_LEAN_MODE = "lean_mode"
+
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+DATA_BADGES = f"{DOMAIN}_badges"
+DATA_MIRROR = f"{DOMAIN}_mirror"
+DATA_EVENTS = f"{DOMAIN}_events"
+DATA_ANNOUNCEMENTS = f"{DOMAIN}_announcements"
+
+KIND_NOTIFICATION = "notification"
+KIND_FIXED_NOTIFICATION = "fixed_notification"
+KIND_REMOVE_FIXED_NOTIFICATION = "remove_fixed_notification"
+
+EVENT_NOTIFICATION_DELIVERED = "oversight_notification_delivered"
+EVENT_NOTIFICATION_FAILED = "oversight_notification_failed"
 
 DEFAULT_PORT = 5001
 DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_LIVENESS_INTERVAL = 5
+LIVENESS_TIMEOUT = 2
+# Polls reuse an /info result this fresh, e.g. one a wake probe just fetched
+INFO_MAX_AGE = 2
+HISTORY_SIZE = 50
+
+HOT_CORNER_OPTIONS = [
+    "top_start",
+    "top_end",
+    "bottom_start",
+    "bottom_end",
+]
@@ -6,10 +6,13 @@ from dataclasses import dataclass
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import OversightApiClient, OversightApiClientError
-from .const import DEFAULT_SCAN_INTERVAL
+from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, INFO_MAX_AGE, LIVENESS_TIMEOUT
+from .debug import span
 
 if TYPE_CHECKING:
     from logging import Logger
@@ -17,7 +20,7 @@ if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
 
-@dataclass
+@dataclass(slots=True)
 class OversightDeviceState:
     """Represent the current state of an OverSight device."""
 
@@ -72,6 +75,7 @@ class OversightDataUpdateCoordinator(DataUpdateCoordinator[OversightDeviceState]
         logger: Logger,
         name: str,
         client: OversightApiClient,
+        liveness: OversightLivenessCoordinator,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
@@ -81,11 +85,72 @@ class OversightDataUpdateCoordinator(DataUpdateCoordinator[OversightDeviceState]
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
         )
         self.client = client
+        self.liveness = liveness
+        # Built once and shared by every entity of the device
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.config_entry.unique_id)},
+            name=self.config_entry.title,
+            manufacturer="OverSight",
+            model="Android TV Overlay",
+        )
 
     async def _async_update_data(self) -> OversightDeviceState:
         """Fetch data from the OverSight device."""
-        try:
-            data = await self.client.async_get_info()
-            return OversightDeviceState.from_api_response(data)
-        except OversightApiClientError as exception:
-            raise UpdateFailed(exception) from exception
+        # Skip the /info retry loop while the device is known to be down
+        if self.liveness.data is False:
+            msg = "Device is not reachable"
+            raise UpdateFailed(msg)
+        with span("refresh", self.name):
+            try:
+                data = await self.client.async_get_info(max_age=INFO_MAX_AGE)
+                return OversightDeviceState.from_api_response(data)
+            except OversightApiClientError as exception:
+                raise UpdateFailed(exception) from exception
+
+
+class OversightLivenessCoordinator(DataUpdateCoordinator[bool]):
+    """Coordinator for a cheap, frequent reachability check of a device."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: Logger,
+        name: str,
+        client: OversightApiClient,
+        interval: float,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            logger,
+            name=name,
+            update_interval=timedelta(seconds=interval),
+            # Listeners only hear about transitions, not every probe
+            always_update=False,
+        )
+        self.client = client
+        self._reconnect_listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_add_reconnect_listener(self, listener: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call listener whenever the device comes back after being down."""
+        self._reconnect_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._reconnect_listeners.remove(listener)
+
+        return remove_listener
+
+    async def _async_update_data(self) -> bool:
+        """Probe the device port."""
+        with span("probe", self.name):
+            alive = await self.client.async_check_alive(LIVENESS_TIMEOUT)
+        if alive != self.data:
+            if not alive:
+                self.logger.info("%s is unreachable", self.name)
+            elif self.data is False:
+                self.logger.info("%s is reachable again", self.name)
+                for listener in list(self._reconnect_listeners):
+                    listener()
+        return alive
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
 
     from .api import OversightApiClient
-    from .coordinator import OversightDataUpdateCoordinator
+    from .coordinator import (
+        OversightDataUpdateCoordinator,
+        OversightLivenessCoordinator,
+    )
+    from .notifier import OversightNotifier
+    from .writer import OversightSettingsWriter
 
 
 type OversightConfigEntry = ConfigEntry[OversightData]
@@ -21,3 +26,8 @@ class OversightData:
 
     client: OversightApiClient
     coordinator: OversightDataUpdateCoordinator
+    liveness: OversightLivenessCoordinator
+    notifier: OversightNotifier
+    writer: OversightSettingsWriter
+    # Options the entry was set up with, to tell option changes from others
+    options: dict[str, Any]
@@ -0,0 +1,137 @@
+"""Opt-in timing spans and profiling for the OverSight request path."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import cProfile
+import functools
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Self
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from contextlib import AbstractContextManager
+
+    from homeassistant.core import HomeAssistant
+
+# Who asked for tracing: config entry ids with the option set, or the service
+_owners: set[str] = set()
+_enabled = False
+
+_current: ContextVar[Span | None] = ContextVar(f"{__package__}.span", default=None)
+
+# Shared by every span() call while tracing is off
+_NOOP = contextlib.nullcontext()
+
+
+def enable_tracing(owner: str) -> None:
+    """Turn tracing on on behalf of an owner."""
+    global _enabled  # noqa: PLW0603
+    _owners.add(owner)
+    _enabled = True
+
+
+def disable_tracing(owner: str) -> None:
+    """Withdraw an owner's request; tracing stops once no owner is left."""
+    global _enabled  # noqa: PLW0603
+    _owners.discard(owner)
+    _enabled = bool(_owners)
+
+
+def tracing_enabled() -> bool:
+    """Return true if spans are being recorded."""
+    return _enabled
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed section of the request path and the spans nested in it."""
+
+    name: str
+    detail: Any = None
+    started: float = 0.0
+    duration: float = 0.0
+    children: list[Span] = field(default_factory=list)
+    _token: Token[Span | None] | None = None
+
+    def __enter__(self) -> Self:
+        """Start timing and become the parent of spans opened inside."""
+        if (parent := _current.get()) is not None:
+            parent.children.append(self)
+        self._token = _current.set(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop timing and log the tree once the outermost span closes."""
+        self.duration = time.perf_counter() - self.started
+        if self._token is None:
+            return
+        root = self._token.old_value in (None, Token.MISSING)
+        _current.reset(self._token)
+        self._token = None
+        if root:
+            LOGGER.info("Trace %s", self.format())
+
+    def format(self) -> str:
+        """Return the span and its children as one line."""
+        label = self.name if self.detail is None else f"{self.name} {self.detail}"
+        text = f"{label} {self.duration * 1000:.1f} ms"
+        if self.children:
+            text += " [" + ", ".join(child.format() for child in self.children) + "]"
+        return text
+
+
+def span(name: str, detail: Any = None) -> AbstractContextManager[Any]:
+    """
+    Time a block when tracing is on.
+
+    While tracing is off this returns a shared no-op context manager, so the
+    cost is one global lookup. Pass variable parts as detail rather than
+    formatting them into the name, so that they are only formatted when the
+    trace is logged.
+    """
+    if not _enabled:
+        return _NOOP
+    return Span(name, detail)
+
+
+def traced[**P, R](
+    name: str,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Wrap a coroutine function in a span."""
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not _enabled:
+                return await func(*args, **kwargs)
+            with Span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async def async_capture_profile(hass: HomeAssistant, duration: float) -> str:
+    """
+    Profile the event loop for a while and write the stats to the config dir.
+
+    Returns the path of the written file, which pstats and snakeviz can read.
+    Raises ValueError if another profiler is running.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        profiler.disable()
+    path = hass.config.path(f"oversight_profile_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+    await hass.async_add_executor_job(profiler.dump_stats, path)
+    return path
@@ -2,12 +2,10 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
 from .coordinator import OversightDataUpdateCoordinator
 
 if TYPE_CHECKING:
@@ -30,9 +28,9 @@ class OversightEntity(CoordinatorEntity[OversightDataUpdateCoordinator]):
         self._attr_unique_id = (
             f"{coordinator.config_entry.unique_id}_{entity_description.key}"
         )
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.config_entry.unique_id)},
-            name=coordinator.config_entry.title,
-            manufacturer="OverSight",
-            model="Android TV Overlay",
-        )
+        self._attr_device_info = coordinator.device_info
+
+    async def _async_write(self, method: str, params: dict[str, Any]) -> None:
+        """Change device settings through the device's write pipeline."""
+        writer = self.coordinator.config_entry.runtime_data.writer
+        await writer.async_write(method, params)
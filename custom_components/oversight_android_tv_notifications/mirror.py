@@ -0,0 +1,274 @@
+"""Mirror Home Assistant entity states onto fixed notifications (badges)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.template import Template
+
+from .api import OversightApiClientError
+from .const import DOMAIN, LOGGER
+from .scheduler import SAVE_DELAY
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from .data import OversightData
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.mirrors"
+
+DEFAULT_DEBOUNCE = 1.0
+
+type BindingKey = tuple[str, str]
+
+
+@dataclass(slots=True)
+class BadgeBinding:
+    """Binding of a source entity to a badge on one device."""
+
+    entry_id: str
+    badge_id: str
+    source_entity: str
+    text: Template
+    fields: dict[str, Any]
+    debounce: float
+    last_payload: dict[str, Any] | None = None
+    timer: asyncio.TimerHandle | None = None
+    sending: bool = False
+    dirty: bool = False
+
+    @property
+    def key(self) -> BindingKey:
+        """Return the binding key."""
+        return (self.entry_id, self.badge_id)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "entry_id": self.entry_id,
+            "badge_id": self.badge_id,
+            "source_entity": self.source_entity,
+            "text": self.text.template,
+            "fields": self.fields,
+            "debounce": self.debounce,
+        }
+
+
+class OversightBadgeMirror:
+    """
+    Keep badges in sync with entity states.
+
+    All bindings share one state-change subscription. Changes are coalesced
+    per binding for its debounce window, and only a change in the rendered
+    payload is sent to the device.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the mirror."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._bindings: dict[BindingKey, BadgeBinding] = {}
+        self._by_entity: dict[str, set[BindingKey]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Restore bindings from storage."""
+        data = await self._store.async_load() or {}
+        for raw in data.get("bindings", []):
+            if self._hass.config_entries.async_get_entry(raw["entry_id"]) is None:
+                continue
+            self._async_add(
+                raw["entry_id"],
+                raw["badge_id"],
+                raw["source_entity"],
+                raw["text"],
+                raw.get("fields") or {},
+                raw.get("debounce", DEFAULT_DEBOUNCE),
+            )
+        self._async_subscribe()
+
+    async def async_shutdown(self) -> None:
+        """Stop listening and flush bindings to storage."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        for binding in self._bindings.values():
+            if binding.timer is not None:
+                binding.timer.cancel()
+                binding.timer = None
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_bind(  # noqa: PLR0913
+        self,
+        entry_id: str,
+        badge_id: str,
+        source_entity: str,
+        text: str,
+        fields: dict[str, Any],
+        debounce: float,
+    ) -> None:
+        """Create or replace a binding and push its current value."""
+        self.async_unbind(entry_id, badge_id)
+        binding = self._async_add(
+            entry_id, badge_id, source_entity, text, fields, debounce
+        )
+        self._async_subscribe()
+        self._async_save()
+        self._async_schedule(binding, 0)
+
+    @callback
+    def async_unbind(self, entry_id: str, badge_id: str) -> bool:
+        """Remove a binding. Return false if there was none."""
+        binding = self._bindings.pop((entry_id, badge_id), None)
+        if binding is None:
+            return False
+        if binding.timer is not None:
+            binding.timer.cancel()
+        keys = self._by_entity[binding.source_entity]
+        keys.discard(binding.key)
+        if not keys:
+            del self._by_entity[binding.source_entity]
+            self._async_subscribe()
+        self._async_save()
+        return True
+
+    @callback
+    def async_refresh_entry(self, entry_id: str) -> None:
+        """Push every binding of an entry, e.g. once it has been set up."""
+        for binding in self._bindings.values():
+            if binding.entry_id == entry_id:
+                binding.last_payload = None
+                self._async_schedule(binding, 0)
+
+    @callback
+    def _async_add(  # noqa: PLR0913
+        self,
+        entry_id: str,
+        badge_id: str,
+        source_entity: str,
+        text: str,
+        fields: dict[str, Any],
+        debounce: float,
+    ) -> BadgeBinding:
+        """Track a binding without subscribing or saving."""
+        binding = BadgeBinding(
+            entry_id=entry_id,
+            badge_id=badge_id,
+            source_entity=source_entity,
+            text=Template(text, self._hass),
+            fields=fields,
+            debounce=debounce,
+        )
+        self._bindings[binding.key] = binding
+        self._by_entity.setdefault(source_entity, set()).add(binding.key)
+        return binding
+
+    @callback
+    def _async_subscribe(self) -> None:
+        """(Re)subscribe to state changes of every bound entity."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if self._by_entity:
+            self._unsub = async_track_state_change_event(
+                self._hass, list(self._by_entity), self._async_state_changed
+            )
+
+    @callback
+    def _async_save(self) -> None:
+        """Schedule a coalesced write to storage."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"bindings": [b.as_dict() for b in self._bindings.values()]}
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Mark bindings of the changed entity for an update."""
+        for key in self._by_entity.get(event.data["entity_id"], ()):
+            binding = self._bindings[key]
+            if binding.timer is None:
+                self._async_schedule(binding, binding.debounce)
+
+    @callback
+    def _async_schedule(self, binding: BadgeBinding, delay: float) -> None:
+        """Arm the flush timer of a binding."""
+        if binding.timer is not None:
+            binding.timer.cancel()
+        binding.timer = self._hass.loop.call_later(
+            delay, self._async_flush, binding.key
+        )
+
+    @callback
+    def _async_flush(self, key: BindingKey) -> None:
+        """Render a binding and send it if the payload changed."""
+        binding = self._bindings.get(key)
+        if binding is None:
+            return
+        binding.timer = None
+        if binding.sending:
+            # Re-render once the in-flight send has finished
+            binding.dirty = True
+            return
+
+        data: OversightData | None = self._hass.data.get(DOMAIN, {}).get(
+            binding.entry_id
+        )
+        state = self._hass.states.get(binding.source_entity)
+        if data is None or state is None:
+            return
+
+        try:
+            text = binding.text.async_render(
+                {"state": state, "value": state.state}, parse_result=False
+            )
+        except TemplateError as exception:
+            LOGGER.warning(
+                "Could not render badge %s from %s: %s",
+                binding.badge_id,
+                binding.source_entity,
+                exception,
+            )
+            return
+
+        payload = {**binding.fields, "id": binding.badge_id, "text": text}
+        if payload == binding.last_payload:
+            return
+        binding.sending = True
+        self._hass.async_create_background_task(
+            self._async_send(binding, data, payload),
+            name=f"{DOMAIN} mirror {binding.badge_id}",
+        )
+
+    async def _async_send(
+        self, binding: BadgeBinding, data: OversightData, payload: dict[str, Any]
+    ) -> None:
+        """Send a rendered payload and record it on success."""
+        try:
+            await data.notifier.async_send_fixed_notification(payload)
+        except OversightApiClientError as exception:
+            LOGGER.debug(
+                "Could not update mirrored badge %s: %s", binding.badge_id, exception
+            )
+        else:
+            binding.last_payload = payload
+        finally:
+            binding.sending = False
+        if binding.dirty:
+            binding.dirty = False
+            self._async_flush(binding.key)
@@ -0,0 +1,297 @@
+"""Notification delivery for a single OverSight Android TV device."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    OversightApiClientCommunicationError,
+    OversightApiClientError,
+    OversightRequestStats,
+    encode_body,
+)
+from .const import (
+    DATA_BADGES,
+    DOMAIN,
+    EVENT_NOTIFICATION_DELIVERED,
+    EVENT_NOTIFICATION_FAILED,
+    HISTORY_SIZE,
+    KIND_FIXED_NOTIFICATION,
+    KIND_NOTIFICATION,
+    KIND_REMOVE_FIXED_NOTIFICATION,
+    LOGGER,
+)
+from .debug import span
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+
+    from .api import OversightApiClient
+    from .badges import OversightBadgeTracker
+    from .coordinator import (
+        OversightDataUpdateCoordinator,
+        OversightLivenessCoordinator,
+    )
+
+
+# Entries whose fallback chain is running in the current task
+_failing_over: ContextVar[frozenset[str]] = ContextVar(
+    f"{__package__}.failing_over", default=frozenset()
+)
+
+
+def payload_digest(body: bytes) -> str:
+    """
+    Return a short digest of an encoded payload.
+
+    The request body is hashed as sent rather than encoded again. Payloads
+    built by the same service or entity list their keys in the same order,
+    so they hash the same.
+    """
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+@dataclass(slots=True, frozen=True)
+class EncodedPayload:
+    """A payload with its request body and digest, worked out once."""
+
+    data: dict[str, Any]
+    body: bytes
+    digest: str
+
+    @classmethod
+    def encode(cls, data: dict[str, Any] | EncodedPayload) -> EncodedPayload:
+        """Encode a payload, passing through one that already is."""
+        if isinstance(data, EncodedPayload):
+            return data
+        with span("encode"):
+            body = encode_body(data)
+            return cls(data, body, payload_digest(body))
+
+
+@dataclass(slots=True)
+class DeliveryRecord:
+    """Outcome of one delivery to a device."""
+
+    time: str
+    kind: str
+    digest: str
+    success: bool
+    attempts: int
+    latency_ms: float
+    badge_id: str | None = None
+    via: str | None = None
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class DeliveryStats(OversightRequestStats):
+    """Request counters plus the fallback target that took the delivery."""
+
+    via: str | None = None
+
+
+class OversightNotifier:
+    """Send popups and badges to a device and keep integration state in sync."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        client: OversightApiClient,
+        coordinator: OversightDataUpdateCoordinator,
+        liveness: OversightLivenessCoordinator,
+        fallback_targets: list[str],
+    ) -> None:
+        """Initialize the notifier."""
+        self._hass = hass
+        self.entry_id = entry_id
+        self.client = client
+        self._coordinator = coordinator
+        self._liveness = liveness
+        self._fallback_targets = fallback_targets
+        self.history: deque[DeliveryRecord] = deque(maxlen=HISTORY_SIZE)
+
+    @property
+    def is_down(self) -> bool:
+        """Return true if the device is known to be unreachable."""
+        return self._liveness.data is False or not self._coordinator.last_update_success
+
+    @property
+    def _badges(self) -> OversightBadgeTracker | None:
+        """Return the shared badge tracker, if it is running."""
+        return self._hass.data.get(DATA_BADGES)
+
+    async def async_send_notification(
+        self, data: dict[str, Any] | EncodedPayload
+    ) -> dict[str, Any]:
+        """Send a popup notification, failing over if the device is down."""
+        return await self._async_record(
+            KIND_NOTIFICATION, EncodedPayload.encode(data), self._async_send_or_failover
+        )
+
+    async def async_wake_and_notify(
+        self, data: dict[str, Any] | EncodedPayload, *, probe: bool = False
+    ) -> dict[str, Any]:
+        """Wake the screen and send a popup in one go."""
+        return await self._async_record(
+            KIND_NOTIFICATION,
+            EncodedPayload.encode(data),
+            lambda payload, stats: self.client.async_wake_and_notify(
+                payload.body, probe=probe, stats=stats
+            ),
+        )
+
+    async def async_send_fixed_notification(
+        self, data: dict[str, Any] | EncodedPayload
+    ) -> dict[str, Any]:
+        """Create, update or hide a fixed notification (badge)."""
+        payload = EncodedPayload.encode(data)
+        kind = (
+            KIND_REMOVE_FIXED_NOTIFICATION
+            if payload.data.get("visible", True) is False
+            else KIND_FIXED_NOTIFICATION
+        )
+        result = await self._async_record(
+            kind,
+            payload,
+            lambda encoded, stats: self.client.async_send_fixed_notification(
+                encoded.body, stats=stats
+            ),
+        )
+        if (badges := self._badges) is not None:
+            badges.async_track(self.entry_id, payload.data)
+        return result
+
+    async def async_remove_fixed_notification(self, badge_id: str) -> dict[str, Any]:
+        """Remove a fixed notification (badge)."""
+        return await self.async_send_fixed_notification(
+            {"id": badge_id, "visible": False}
+        )
+
+    async def _async_record(
+        self,
+        kind: str,
+        payload: EncodedPayload,
+        send: Callable[[EncodedPayload, DeliveryStats], Awaitable[Any]],
+    ) -> Any:
+        """Run a delivery, then log it to the history and the event bus."""
+        stats = DeliveryStats()
+        started = time.monotonic()
+        record = DeliveryRecord(
+            time=dt_util.utcnow().isoformat(),
+            kind=kind,
+            digest=payload.digest,
+            success=False,
+            attempts=0,
+            latency_ms=0,
+            badge_id=payload.data.get("id") if kind != KIND_NOTIFICATION else None,
+        )
+        try:
+            result = await send(payload, stats)
+        except OversightApiClientError as exception:
+            record.error = str(exception)
+            raise
+        else:
+            record.success = True
+            return result
+        finally:
+            record.attempts = stats.attempts
+            record.via = stats.via
+            record.latency_ms = round((time.monotonic() - started) * 1000, 1)
+            self.history.append(record)
+            self._hass.bus.async_fire(
+                EVENT_NOTIFICATION_DELIVERED
+                if record.success
+                else EVENT_NOTIFICATION_FAILED,
+                {"entry_id": self.entry_id, **asdict(record)},
+            )
+
+    async def _async_send_or_failover(
+        self, payload: EncodedPayload, stats: DeliveryStats
+    ) -> dict[str, Any]:
+        """Send a popup to this device or to its fallback chain."""
+        if self.entry_id in _failing_over.get():
+            # Reached again from our own chain, e.g. through a notify group
+            # that has this device in it; failing over again would never end
+            msg = f"Device at {self.client.base_url} is unreachable"
+            raise OversightApiClientCommunicationError(msg)
+        if not self._fallback_targets:
+            return await self.client.async_send_notification(payload.body, stats=stats)
+        if self.is_down:
+            return await self._async_failover(payload, stats)
+        try:
+            # A fallback is waiting, so do not sit through the retry loop
+            return await self.client.async_send_notification(
+                payload.body, retries=0, stats=stats
+            )
+        except OversightApiClientCommunicationError:
+            return await self._async_failover(payload, stats)
+
+    async def _async_failover(
+        self, payload: EncodedPayload, stats: DeliveryStats
+    ) -> dict[str, Any]:
+        """Deliver a popup to the first fallback target that accepts it."""
+        token = _failing_over.set(_failing_over.get() | {self.entry_id})
+        try:
+            return await self._async_try_fallbacks(payload, stats)
+        finally:
+            _failing_over.reset(token)
+
+    async def _async_try_fallbacks(
+        self, payload: EncodedPayload, stats: DeliveryStats
+    ) -> dict[str, Any]:
+        """Walk the fallback targets in order."""
+        ent_reg = er.async_get(self._hass)
+        domain_data = self._hass.data.get(DOMAIN, {})
+        for target in self._fallback_targets:
+            registry_entry = ent_reg.async_get(target)
+            entry_id = registry_entry.config_entry_id if registry_entry else None
+            try:
+                if entry_id in domain_data:
+                    if entry_id == self.entry_id:
+                        continue
+                    # Skip TVs that are down too, without their own chains
+                    other: OversightNotifier = domain_data[entry_id].notifier
+                    if other.is_down:
+                        continue
+                    result = await other.client.async_send_notification(
+                        payload.body, retries=0
+                    )
+                else:
+                    await self._async_send_to_notify_entity(target, payload.data)
+                    result = {}
+            except (OversightApiClientCommunicationError, HomeAssistantError) as err:
+                LOGGER.debug("Fallback %s failed: %s", target, err)
+                continue
+            LOGGER.debug("Delivered popup for %s via %s", self.entry_id, target)
+            stats.via = target
+            return result
+
+        msg = (
+            f"Device at {self.client.base_url} is unreachable and no fallback "
+            "target accepted the notification"
+        )
+        raise OversightApiClientCommunicationError(msg)
+
+    async def _async_send_to_notify_entity(
+        self, entity_id: str, data: dict[str, Any]
+    ) -> None:
+        """Send a popup to any Home Assistant notify entity."""
+        service_data = {"entity_id": entity_id, "message": data["message"]}
+        if data.get("title"):
+            service_data["title"] = data["title"]
+        await self._hass.services.async_call(
+            "notify", "send_message", service_data, blocking=True
+        )
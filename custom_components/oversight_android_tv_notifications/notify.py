@@ -61,4 +61,5 @@ class OversightNotifyEntity(OversightEntity, NotifyEntity):
             if field in extra:
                 data[field] = extra[field]
 
-        await self.coordinator.client.async_send_notification(data)
+        notifier = self.coordinator.config_entry.runtime_data.notifier
+        await notifier.async_send_notification(data)
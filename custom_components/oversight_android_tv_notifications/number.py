@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
 from homeassistant.components.number import (
@@ -18,6 +19,7 @@ if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .coordinator import OversightDataUpdateCoordinator
     from .data import OversightConfigEntry
 
 
@@ -106,16 +108,26 @@ class OversightNumber(OversightEntity, NumberEntity):
 
     entity_description: OversightNumberDescription
 
+    def __init__(
+        self,
+        coordinator: OversightDataUpdateCoordinator,
+        entity_description: OversightNumberDescription,
+    ) -> None:
+        """Initialize the number entity."""
+        super().__init__(coordinator, entity_description)
+        # Resolve the description once rather than on every state read
+        self._get_state = attrgetter(entity_description.state_key)
+
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
         if self.coordinator.data is None:
             return None
-        return getattr(self.coordinator.data, self.entity_description.state_key, None)
+        return self._get_state(self.coordinator.data)
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the value."""
-        client = self.coordinator.client
-        method = getattr(client, self.entity_description.api_method)
-        await method(**{self.entity_description.api_param: int(value)})
-        await self.coordinator.async_request_refresh()
+        await self._async_write(
+            self.entity_description.api_method,
+            {self.entity_description.api_param: int(value)},
+        )
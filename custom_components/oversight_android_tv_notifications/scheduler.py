@@ -0,0 +1,318 @@
+"""Scheduled notification delivery for OverSight Android TV."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.ulid import ulid_now
+
+from .api import OversightApiClientError
+from .const import DOMAIN, KIND_FIXED_NOTIFICATION, KIND_NOTIFICATION, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from .notifier import OversightNotifier
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.scheduled"
+
+# Coalesce bursts of schedule/cancel calls into a single write
+SAVE_DELAY = 5
+
+# How long to hold an item whose config entry is not loaded yet
+NOT_LOADED_RETRY = timedelta(seconds=30)
+
+type ScheduleKey = tuple[str, str]
+
+
+class DeadlineHeap[K: Hashable]:
+    """
+    Min-heap of keyed deadlines driving a single Home Assistant timer.
+
+    Only the earliest deadline is ever armed. Rescheduled and discarded keys
+    are deleted lazily when they surface at the top of the heap.
+    """
+
+    def __init__(self, hass: HomeAssistant, on_due: Callable[[K], None]) -> None:
+        """Initialize the heap."""
+        self._hass = hass
+        self._on_due = on_due
+        self._heap: list[tuple[float, int, K]] = []
+        self._deadlines: dict[K, float] = {}
+        self._counter = itertools.count()
+        self._unsub: CALLBACK_TYPE | None = None
+        self._armed_at: float | None = None
+
+    def __len__(self) -> int:
+        """Return the number of pending deadlines."""
+        return len(self._deadlines)
+
+    def __contains__(self, key: K) -> bool:
+        """Return true if the key has a pending deadline."""
+        return key in self._deadlines
+
+    @callback
+    def async_push(self, key: K, when: datetime) -> None:
+        """Set or replace the deadline for a key."""
+        timestamp = when.timestamp()
+        self._deadlines[key] = timestamp
+        heapq.heappush(self._heap, (timestamp, next(self._counter), key))
+        self._async_compact()
+        self._async_arm()
+
+    @callback
+    def async_discard(self, key: K) -> None:
+        """Forget the deadline for a key, if any."""
+        if self._deadlines.pop(key, None) is None:
+            return
+        self._async_compact()
+        self._async_arm()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the armed timer."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+            self._armed_at = None
+
+    @callback
+    def _async_compact(self) -> None:
+        """Drop stale entries once they dominate the heap."""
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            deadlines = self._deadlines
+            self._heap = [
+                entry for entry in self._heap if deadlines.get(entry[2]) == entry[0]
+            ]
+            heapq.heapify(self._heap)
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the timer for the earliest live deadline."""
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        if not heap:
+            self.async_shutdown()
+            return
+        timestamp = heap[0][0]
+        if timestamp == self._armed_at:
+            return
+        self.async_shutdown()
+        self._armed_at = timestamp
+        self._unsub = async_track_point_in_utc_time(
+            self._hass, self._async_fire, dt_util.utc_from_timestamp(timestamp)
+        )
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        """Pop every deadline that has passed and notify the owner."""
+        self._unsub = None
+        self._armed_at = None
+        cutoff = now.timestamp()
+        heap = self._heap
+        due: list[K] = []
+        while heap and heap[0][0] <= cutoff:
+            timestamp, _, key = heapq.heappop(heap)
+            if self._deadlines.get(key) == timestamp:
+                del self._deadlines[key]
+                due.append(key)
+        for key in due:
+            self._on_due(key)
+        self._async_arm()
+
+
+@dataclass(slots=True)
+class ScheduledNotification:
+    """A notification waiting to be delivered."""
+
+    schedule_id: str
+    entry_id: str
+    kind: str
+    payload: dict[str, Any]
+    due: datetime
+
+    @property
+    def key(self) -> ScheduleKey:
+        """Return the heap key; a schedule id has one item per device."""
+        return (self.schedule_id, self.entry_id)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "schedule_id": self.schedule_id,
+            "entry_id": self.entry_id,
+            "kind": self.kind,
+            "payload": self.payload,
+            "due": self.due.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ScheduledNotification | None:
+        """Restore a stored item, returning None if it is malformed."""
+        due = dt_util.parse_datetime(data.get("due") or "")
+        if due is None or data.get("kind") not in (
+            KIND_NOTIFICATION,
+            KIND_FIXED_NOTIFICATION,
+        ):
+            return None
+        return cls(
+            schedule_id=data["schedule_id"],
+            entry_id=data["entry_id"],
+            kind=data["kind"],
+            payload=data.get("payload") or {},
+            due=dt_util.as_utc(due),
+        )
+
+
+class OversightScheduler:
+    """
+    Deliver delayed notifications for every OverSight entry from one timer.
+
+    A schedule id names one delivery to each of the devices it targets, and
+    replacing or cancelling it covers all of them.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._items: dict[str, dict[str, ScheduledNotification]] = {}
+        self._heap: DeadlineHeap[ScheduleKey] = DeadlineHeap(hass, self._async_on_due)
+
+    async def async_load(self) -> None:
+        """Restore pending items from storage."""
+        data = await self._store.async_load() or {}
+        for raw in data.get("items", []):
+            item = ScheduledNotification.from_dict(raw)
+            if item is not None and item.entry_id not in self._items.get(
+                item.schedule_id, {}
+            ):
+                self._async_add(item)
+
+    async def async_shutdown(self) -> None:
+        """Stop the timer and flush pending items to storage."""
+        self._heap.async_shutdown()
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_schedule(
+        self,
+        entry_ids: list[str],
+        kind: str,
+        payload: dict[str, Any],
+        due: datetime,
+        schedule_id: str | None = None,
+    ) -> str:
+        """Schedule a notification to devices, replacing any with the same id."""
+        schedule_id = schedule_id or ulid_now()
+        self._async_discard(schedule_id)
+        due = dt_util.as_utc(due)
+        for entry_id in entry_ids:
+            self._async_add(
+                ScheduledNotification(
+                    schedule_id=schedule_id,
+                    entry_id=entry_id,
+                    kind=kind,
+                    payload=payload,
+                    due=due,
+                )
+            )
+        self._async_save()
+        return schedule_id
+
+    @callback
+    def async_cancel(self, schedule_id: str) -> bool:
+        """Cancel a pending schedule. Return false if it was not found."""
+        if not self._async_discard(schedule_id):
+            return False
+        self._async_save()
+        return True
+
+    @callback
+    def _async_add(self, item: ScheduledNotification) -> None:
+        """Track an item and push its deadline."""
+        self._items.setdefault(item.schedule_id, {})[item.entry_id] = item
+        self._heap.async_push(item.key, item.due)
+
+    @callback
+    def _async_discard(self, schedule_id: str) -> bool:
+        """Drop the items of a schedule. Return false if there were none."""
+        items = self._items.pop(schedule_id, None)
+        if items is None:
+            return False
+        for item in items.values():
+            self._heap.async_discard(item.key)
+        return True
+
+    @callback
+    def _async_save(self) -> None:
+        """Schedule a coalesced write to storage."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {
+            "items": [
+                item.as_dict()
+                for items in self._items.values()
+                for item in items.values()
+            ]
+        }
+
+    @callback
+    def _async_on_due(self, key: ScheduleKey) -> None:
+        """Hand a due item off for delivery."""
+        schedule_id, entry_id = key
+        items = self._items.get(schedule_id)
+        if items is None or (item := items.pop(entry_id, None)) is None:
+            return
+        if not items:
+            del self._items[schedule_id]
+        self._async_save()
+
+        data = self._hass.data.get(DOMAIN, {}).get(item.entry_id)
+        if data is None:
+            entry = self._hass.config_entries.async_get_entry(item.entry_id)
+            if entry is None or entry.disabled_by is not None:
+                LOGGER.warning(
+                    "Dropping scheduled notification %s: device is no longer "
+                    "configured",
+                    schedule_id,
+                )
+                return
+            # The entry is still setting up, e.g. right after a restart
+            item.due = dt_util.utcnow() + NOT_LOADED_RETRY
+            self._async_add(item)
+            return
+
+        self._hass.async_create_background_task(
+            self._async_deliver(item, data.notifier),
+            name=f"{DOMAIN} scheduled {schedule_id}",
+        )
+
+    async def _async_deliver(
+        self, item: ScheduledNotification, notifier: OversightNotifier
+    ) -> None:
+        """Deliver a due item."""
+        try:
+            if item.kind == KIND_FIXED_NOTIFICATION:
+                await notifier.async_send_fixed_notification(item.payload)
+            else:
+                await notifier.async_send_notification(item.payload)
+        except OversightApiClientError as exception:
+            LOGGER.warning(
+                "Failed to deliver scheduled notification %s: %s",
+                item.schedule_id,
+                exception,
+            )
@@ -2,32 +2,42 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.const import EntityCategory
 
+from .const import HOT_CORNER_OPTIONS
 from .entity import OversightEntity
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .coordinator import OversightDataUpdateCoordinator
     from .data import OversightConfigEntry
 
-HOT_CORNER_OPTIONS = [
-    "top_start",
-    "top_end",
-    "bottom_start",
-    "bottom_end",
-]
 
-ENTITY_DESCRIPTIONS = (
-    SelectEntityDescription(
+@dataclass(frozen=True, kw_only=True)
+class OversightSelectDescription(SelectEntityDescription):
+    """Describe an OverSight select entity."""
+
+    state_key: str = ""
+    api_method: str = ""
+    api_param: str = ""
+
+
+ENTITY_DESCRIPTIONS: tuple[OversightSelectDescription, ...] = (
+    OversightSelectDescription(
         key="hot_corner",
         translation_key="hot_corner",
         options=HOT_CORNER_OPTIONS,
         entity_category=EntityCategory.CONFIG,
+        state_key="hot_corner",
+        api_method="async_set_overlay",
+        api_param="hotCorner",
     ),
 )
 
@@ -39,7 +49,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up OverSight select entities."""
     async_add_entities(
-        OversightHotCornerSelect(
+        OversightSelect(
             coordinator=entry.runtime_data.coordinator,
             entity_description=description,
         )
@@ -47,17 +57,30 @@ async def async_setup_entry(
     )
 
 
-class OversightHotCornerSelect(OversightEntity, SelectEntity):
-    """Select entity for the hot corner position."""
+class OversightSelect(OversightEntity, SelectEntity):
+    """Select entity for an OverSight device setting."""
+
+    entity_description: OversightSelectDescription
+
+    def __init__(
+        self,
+        coordinator: OversightDataUpdateCoordinator,
+        entity_description: OversightSelectDescription,
+    ) -> None:
+        """Initialize the select entity."""
+        super().__init__(coordinator, entity_description)
+        self._get_state = attrgetter(entity_description.state_key)
 
     @property
     def current_option(self) -> str | None:
-        """Return the current hot corner setting."""
+        """Return the current option."""
         if self.coordinator.data is None:
             return None
-        return self.coordinator.data.hot_corner
+        return self._get_state(self.coordinator.data)
 
     async def async_select_option(self, option: str) -> None:
-        """Change the hot corner setting."""
-        await self.coordinator.client.async_set_overlay(hotCorner=option)
-        await self.coordinator.async_request_refresh()
+        """Change the selected option."""
+        await self._async_write(
+            self.entity_description.api_method,
+            {self.entity_description.api_param: option},
+        )
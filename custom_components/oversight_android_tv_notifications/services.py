@@ -0,0 +1,630 @@
+"""Services for the OverSight Android TV integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .api import OversightApiClient, OversightApiClientError
+from .const import (
+    DATA_MIRROR,
+    DATA_SCHEDULER,
+    DOMAIN,
+    KIND_FIXED_NOTIFICATION,
+    KIND_NOTIFICATION,
+    LOGGER,
+)
+from .debug import (
+    async_capture_profile,
+    disable_tracing,
+    enable_tracing,
+    span,
+    traced,
+)
+from .mirror import DEFAULT_DEBOUNCE
+from .notifier import EncodedPayload
+from .number import ENTITY_DESCRIPTIONS as NUMBER_DESCRIPTIONS
+from .select import ENTITY_DESCRIPTIONS as SELECT_DESCRIPTIONS
+from .switch import ENTITY_DESCRIPTIONS as SWITCH_DESCRIPTIONS
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .data import OversightData
+    from .mirror import OversightBadgeMirror
+    from .scheduler import OversightScheduler
+
+
+def _get_entry_id_for_entity(hass: HomeAssistant, entity_id: str) -> str | None:
+    """Resolve an entity_id to the id of its loaded config entry."""
+    ent_reg = er.async_get(hass)
+    entry = ent_reg.async_get(entity_id)
+    if entry is None or entry.config_entry_id is None:
+        return None
+    if entry.config_entry_id not in hass.data.get(DOMAIN, {}):
+        return None
+    return entry.config_entry_id
+
+
+def _get_entry_id_from_call(hass: HomeAssistant, call: ServiceCall) -> str:
+    """Get a config entry id from a service call's entity target."""
+    entity_ids = call.data.get("entity_id", [])
+    if isinstance(entity_ids, str):
+        entity_ids = [entity_ids]
+
+    # Try entity targeting first
+    for eid in entity_ids:
+        entry_id = _get_entry_id_for_entity(hass, eid)
+        if entry_id is not None:
+            return entry_id
+
+    # Fallback: use first available entry
+    entries = hass.data.get(DOMAIN, {})
+    if entries:
+        return next(iter(entries))
+
+    msg = "No OverSight devices configured"
+    raise ValueError(msg)
+
+
+def _get_entry_ids_from_call(hass: HomeAssistant, call: ServiceCall) -> list[str]:
+    """Get every targeted config entry id, falling back to the first entry."""
+    entity_ids = call.data.get("entity_id", [])
+    if isinstance(entity_ids, str):
+        entity_ids = [entity_ids]
+
+    entry_ids: dict[str, None] = {}
+    for eid in entity_ids:
+        entry_id = _get_entry_id_for_entity(hass, eid)
+        if entry_id is not None:
+            entry_ids[entry_id] = None
+    if entry_ids:
+        return list(entry_ids)
+    return [_get_entry_id_from_call(hass, call)]
+
+
+def _get_client_from_call(hass: HomeAssistant, call: ServiceCall) -> OversightApiClient:
+    """Get a client from a service call's entity target."""
+    return hass.data[DOMAIN][_get_entry_id_from_call(hass, call)].client
+
+
+def _get_scheduler(hass: HomeAssistant) -> OversightScheduler:
+    """Get the shared scheduler, which exists while any entry is loaded."""
+    if DATA_SCHEDULER not in hass.data:
+        msg = "No OverSight devices configured"
+        raise ValueError(msg)
+    return hass.data[DATA_SCHEDULER]
+
+
+def _schedule_from_call(
+    hass: HomeAssistant, call: ServiceCall, kind: str, data: dict[str, Any]
+) -> ServiceResponse:
+    """Queue a payload for later delivery if the call asked for it."""
+    if "send_at" in call.data:
+        due = dt_util.as_utc(call.data["send_at"])
+    else:
+        due = dt_util.utcnow() + call.data["delay"]
+
+    schedule_id = _get_scheduler(hass).async_schedule(
+        _get_entry_ids_from_call(hass, call),
+        kind,
+        data,
+        due,
+        schedule_id=call.data.get("schedule_id"),
+    )
+    if call.return_response:
+        return {"schedule_id": schedule_id, "send_at": due.isoformat()}
+    return None
+
+
+def _build_notification(call: ServiceCall) -> dict[str, Any]:
+    """Build a popup payload from a service call."""
+    with span("build"):
+        data: dict[str, Any] = {"message": call.data["message"]}
+        for field in (
+            "title",
+            "source",
+            "image",
+            "video",
+            "small_icon",
+            "small_icon_color",
+            "large_icon",
+            "corner",
+            "duration",
+        ):
+            if field in call.data:
+                camel = _to_camel_case(field)
+                data[camel] = call.data[field]
+        return data
+
+
+NOTIFICATION_SCHEMA: dict[Any, Any] = {
+    vol.Required("message"): str,
+    vol.Optional("title"): str,
+    vol.Optional("source"): str,
+    vol.Optional("image"): str,
+    vol.Optional("video"): str,
+    vol.Optional("small_icon"): str,
+    vol.Optional("small_icon_color"): str,
+    vol.Optional("large_icon"): str,
+    vol.Optional("corner"): str,
+    vol.Optional("duration"): int,
+}
+
+FIXED_NOTIFICATION_FIELDS = (
+    "icon",
+    "text",
+    "icon_color",
+    "message_color",
+    "background_color",
+    "border_color",
+    "shape",
+    "size",
+    "expiration",
+    "show_duration",
+    "collapse_duration",
+    "repeat_expand",
+)
+
+# Mirrored badges take their text from the template and never expire
+MIRROR_FIELDS = tuple(
+    field for field in FIXED_NOTIFICATION_FIELDS if field not in ("text", "expiration")
+)
+
+
+def _build_fixed_notification(
+    call: ServiceCall, fields: tuple[str, ...]
+) -> dict[str, Any]:
+    """Build a badge payload from a service call."""
+    with span("build"):
+        data: dict[str, Any] = {"id": call.data["id"]}
+        for field in fields:
+            if field in call.data:
+                # Convert snake_case to camelCase for the API
+                camel = _to_camel_case(field)
+                data[camel] = call.data[field]
+        return data
+
+
+FIXED_NOTIFICATION_SCHEMA: dict[Any, Any] = {
+    vol.Required("id"): str,
+    vol.Optional("icon"): str,
+    vol.Optional("icon_color"): str,
+    vol.Optional("message_color"): str,
+    vol.Optional("background_color"): str,
+    vol.Optional("border_color"): str,
+    vol.Optional("shape"): str,
+    vol.Optional("size"): str,
+    vol.Optional("show_duration"): int,
+    vol.Optional("collapse_duration"): int,
+    vol.Optional("repeat_expand"): bool,
+}
+
+# Device settings by service field, as written by the CONFIG entities: client
+# method and API parameter
+SETTINGS: dict[str, tuple[str, str]] = {
+    description.key: (description.api_method, description.api_param)
+    for description in (
+        *NUMBER_DESCRIPTIONS,
+        *SELECT_DESCRIPTIONS,
+        *SWITCH_DESCRIPTIONS,
+    )
+}
+
+# Validated as the entities would: numbers within their range, select options
+# and switch states
+SETTINGS_SCHEMA: dict[Any, Any] = {
+    **{
+        vol.Optional(description.key): vol.All(
+            vol.Coerce(int),
+            vol.Range(description.native_min_value, description.native_max_value),
+        )
+        for description in NUMBER_DESCRIPTIONS
+    },
+    **{
+        vol.Optional(description.key): vol.In(description.options)
+        for description in SELECT_DESCRIPTIONS
+    },
+    **{
+        vol.Optional(description.key): cv.boolean for description in SWITCH_DESCRIPTIONS
+    },
+}
+
+# Owner under which the set_debug_tracing service holds tracing on
+TRACING_SERVICE_OWNER = "service"
+
+SCHEDULE_SCHEMA: dict[Any, Any] = {
+    vol.Exclusive("send_at", "schedule"): cv.datetime,
+    vol.Exclusive("delay", "schedule"): cv.positive_time_period,
+    vol.Optional("schedule_id"): str,
+}
+
+
+async def _async_broadcast(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    send: Callable[[OversightData], Awaitable[Any]],
+) -> dict[str, Any]:
+    """Run a send for every targeted device at once and collect the outcomes."""
+    domain_data = hass.data[DOMAIN]
+
+    async def send_one(entry_id: str) -> dict[str, Any]:
+        oversight = domain_data[entry_id]
+        entry = oversight.coordinator.config_entry
+        started = time.monotonic()
+        result: dict[str, Any] = {
+            "device": entry.title,
+            "device_id": entry.unique_id,
+        }
+        try:
+            await send(oversight)
+        except OversightApiClientError as exception:
+            result["success"] = False
+            result["error"] = str(exception)
+        else:
+            result["success"] = True
+        result["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+        return result
+
+    entry_ids = _get_entry_ids_from_call(hass, call)
+    started = time.monotonic()
+    results = await asyncio.gather(*(send_one(eid) for eid in entry_ids))
+    latency_ms = round((time.monotonic() - started) * 1000, 1)
+    LOGGER.debug(
+        "%s to %s device(s) took %s ms", call.service, len(results), latency_ms
+    )
+
+    if not any(result["success"] for result in results):
+        msg = "; ".join(f"{r['device']}: {r['error']}" for r in results)
+        raise OversightApiClientError(msg)
+    return {"latency_ms": latency_ms, "devices": list(results)}
+
+
+@traced("service.send_notification")
+async def _async_handle_send_notification(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Handle the send_notification service call."""
+    data = _build_notification(call)
+    if "send_at" in call.data or "delay" in call.data:
+        return _schedule_from_call(hass, call, KIND_NOTIFICATION, data)
+    # Encode once, however many devices the popup goes to
+    payload = EncodedPayload.encode(data)
+    response = await _async_broadcast(
+        hass,
+        call,
+        lambda oversight: oversight.notifier.async_send_notification(payload),
+    )
+    if call.return_response:
+        return response
+    return None
+
+
+@traced("service.send_fixed_notification")
+async def _async_handle_send_fixed_notification(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Handle the send_fixed_notification service call."""
+    data = _build_fixed_notification(call, FIXED_NOTIFICATION_FIELDS)
+    if "send_at" in call.data or "delay" in call.data:
+        return _schedule_from_call(hass, call, KIND_FIXED_NOTIFICATION, data)
+    # Encode once, however many devices the badge goes to
+    payload = EncodedPayload.encode(data)
+    response = await _async_broadcast(
+        hass,
+        call,
+        lambda oversight: oversight.notifier.async_send_fixed_notification(payload),
+    )
+    if call.return_response:
+        return response
+    return None
+
+
+@traced("service.remove_fixed_notification")
+async def _async_handle_remove_fixed_notification(
+    hass: HomeAssistant, call: ServiceCall
+) -> None:
+    """Handle the remove_fixed_notification service call."""
+    badge_id = call.data["id"]
+    await _async_broadcast(
+        hass,
+        call,
+        lambda oversight: oversight.notifier.async_remove_fixed_notification(badge_id),
+    )
+
+
+@traced("service.screen_on")
+async def _async_handle_screen_on(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Handle the screen_on service call."""
+    client = _get_client_from_call(hass, call)
+    await client.async_screen_on()
+
+
+@traced("service.wake_and_notify")
+async def _async_handle_wake_and_notify(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Handle the wake_and_notify service call."""
+    payload = EncodedPayload.encode(_build_notification(call))
+    probe = call.data["probe"]
+    response = await _async_broadcast(
+        hass,
+        call,
+        lambda oversight: oversight.notifier.async_wake_and_notify(
+            payload, probe=probe
+        ),
+    )
+    if call.return_response:
+        return response
+    return None
+
+
+@traced("service.cancel_scheduled_notification")
+async def _async_handle_cancel_scheduled_notification(
+    hass: HomeAssistant, call: ServiceCall
+) -> None:
+    """Handle the cancel_scheduled_notification service call."""
+    if not _get_scheduler(hass).async_cancel(call.data["schedule_id"]):
+        LOGGER.debug("No scheduled notification with id %s", call.data["schedule_id"])
+
+
+@traced("service.mirror_fixed_notification")
+async def _async_handle_mirror_fixed_notification(
+    hass: HomeAssistant, call: ServiceCall
+) -> None:
+    """Handle the mirror_fixed_notification service call."""
+    fields = _build_fixed_notification(call, MIRROR_FIELDS)
+    del fields["id"]
+    mirror: OversightBadgeMirror = hass.data[DATA_MIRROR]
+    for entry_id in _get_entry_ids_from_call(hass, call):
+        mirror.async_bind(
+            entry_id,
+            call.data["id"],
+            call.data["source_entity"],
+            call.data["text"],
+            fields,
+            call.data["debounce"],
+        )
+
+
+@traced("service.unmirror_fixed_notification")
+async def _async_handle_unmirror_fixed_notification(
+    hass: HomeAssistant, call: ServiceCall
+) -> None:
+    """Handle the unmirror_fixed_notification service call."""
+    mirror: OversightBadgeMirror = hass.data[DATA_MIRROR]
+    for entry_id in _get_entry_ids_from_call(hass, call):
+        if mirror.async_unbind(entry_id, call.data["id"]):
+            await hass.data[DOMAIN][entry_id].notifier.async_remove_fixed_notification(
+                call.data["id"]
+            )
+
+
+@traced("service.get_history")
+async def _async_handle_get_history(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Handle the get_history service call."""
+    devices = []
+    for entry_id in _get_entry_ids_from_call(hass, call):
+        oversight = hass.data[DOMAIN][entry_id]
+        entry = oversight.coordinator.config_entry
+        devices.append(
+            {
+                "device": entry.title,
+                "device_id": entry.unique_id,
+                "history": [asdict(record) for record in oversight.notifier.history],
+            }
+        )
+    return {"devices": devices}
+
+
+@traced("service.configure")
+async def _async_handle_configure(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Handle the configure service call."""
+    # One request per settings endpoint, whatever the number of fields
+    requests: dict[str, dict[str, Any]] = {}
+    for field, (method, param) in SETTINGS.items():
+        if field in call.data:
+            requests.setdefault(method, {})[param] = call.data[field]
+    if not requests:
+        msg = "No settings given"
+        raise ValueError(msg)
+
+    async def configure(oversight: OversightData) -> None:
+        # Queued together, so the writer refreshes once after the last one
+        await asyncio.gather(
+            *(
+                oversight.writer.async_write(method, params)
+                for method, params in requests.items()
+            )
+        )
+
+    response = await _async_broadcast(hass, call, configure)
+    if call.return_response:
+        return response
+    return None
+
+
+async def _async_handle_set_debug_tracing(
+    hass: HomeAssistant,  # noqa: ARG001
+    call: ServiceCall,
+) -> None:
+    """Handle the set_debug_tracing service call."""
+    if call.data["enabled"]:
+        enable_tracing(TRACING_SERVICE_OWNER)
+    else:
+        disable_tracing(TRACING_SERVICE_OWNER)
+
+
+async def _async_handle_capture_profile(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Handle the capture_profile service call."""
+    duration = call.data["duration"]
+    LOGGER.info("Profiling the event loop for %s seconds", duration)
+    try:
+        path = await async_capture_profile(hass, duration)
+    except ValueError as exception:
+        # Another profiler, e.g. a capture still running, holds the hook
+        msg = f"Could not start profiling: {exception}"
+        raise HomeAssistantError(msg) from exception
+    LOGGER.info("Wrote profile to %s", path)
+    if call.return_response:
+        return {"path": path}
+    return None
+
+
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register custom services for OverSight."""
+    hass.services.async_register(
+        DOMAIN,
+        "send_notification",
+        partial(_async_handle_send_notification, hass),
+        schema=vol.Schema(
+            {
+                **NOTIFICATION_SCHEMA,
+                **SCHEDULE_SCHEMA,
+            },
+            extra=vol.ALLOW_EXTRA,
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "send_fixed_notification",
+        partial(_async_handle_send_fixed_notification, hass),
+        schema=vol.Schema(
+            {
+                **FIXED_NOTIFICATION_SCHEMA,
+                vol.Optional("text"): str,
+                vol.Optional("expiration"): str,
+                **SCHEDULE_SCHEMA,
+            },
+            extra=vol.ALLOW_EXTRA,
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "remove_fixed_notification",
+        partial(_async_handle_remove_fixed_notification, hass),
+        schema=vol.Schema(
+            {vol.Required("id"): str},
+            extra=vol.ALLOW_EXTRA,
+        ),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "screen_on",
+        partial(_async_handle_screen_on, hass),
+        schema=vol.Schema({}, extra=vol.ALLOW_EXTRA),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "wake_and_notify",
+        partial(_async_handle_wake_and_notify, hass),
+        schema=vol.Schema(
+            {
+                **NOTIFICATION_SCHEMA,
+                vol.Optional("probe", default=False): bool,
+            },
+            extra=vol.ALLOW_EXTRA,
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "cancel_scheduled_notification",
+        partial(_async_handle_cancel_scheduled_notification, hass),
+        schema=vol.Schema({vol.Required("schedule_id"): str}),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "mirror_fixed_notification",
+        partial(_async_handle_mirror_fixed_notification, hass),
+        schema=vol.Schema(
+            {
+                **FIXED_NOTIFICATION_SCHEMA,
+                vol.Required("source_entity"): cv.entity_id,
+                vol.Required("text"): cv.string,
+                vol.Optional("debounce", default=DEFAULT_DEBOUNCE): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=3600)
+                ),
+            },
+            extra=vol.ALLOW_EXTRA,
+        ),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "unmirror_fixed_notification",
+        partial(_async_handle_unmirror_fixed_notification, hass),
+        schema=vol.Schema(
+            {vol.Required("id"): str},
+            extra=vol.ALLOW_EXTRA,
+        ),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_history",
+        partial(_async_handle_get_history, hass),
+        schema=vol.Schema({}, extra=vol.ALLOW_EXTRA),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "configure",
+        partial(_async_handle_configure, hass),
+        schema=vol.Schema(SETTINGS_SCHEMA, extra=vol.ALLOW_EXTRA),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "set_debug_tracing",
+        partial(_async_handle_set_debug_tracing, hass),
+        schema=vol.Schema({vol.Required("enabled"): cv.boolean}),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "capture_profile",
+        partial(_async_handle_capture_profile, hass),
+        schema=vol.Schema(
+            {
+                vol.Optional("duration", default=30): vol.All(
+                    vol.Coerce(float), vol.Range(min=1, max=600)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _to_camel_case(snake_str: str) -> str:
+    """Convert snake_case to camelCase."""
+    parts = snake_str.split("_")
+    return parts[0] + "".join(word.capitalize() for word in parts[1:])
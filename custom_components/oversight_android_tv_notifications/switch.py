@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
@@ -14,6 +15,7 @@ if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .coordinator import OversightDataUpdateCoordinator
     from .data import OversightConfigEntry
 
 
@@ -74,23 +76,32 @@ class OversightSwitch(OversightEntity, SwitchEntity):
 
     entity_description: OversightSwitchDescription
 
+    def __init__(
+        self,
+        coordinator: OversightDataUpdateCoordinator,
+        entity_description: OversightSwitchDescription,
+    ) -> None:
+        """Initialize the switch entity."""
+        super().__init__(coordinator, entity_description)
+        self._get_state = attrgetter(entity_description.state_key)
+
     @property
     def is_on(self) -> bool | None:
         """Return true if the switch is on."""
         if self.coordinator.data is None:
             return None
-        return getattr(self.coordinator.data, self.entity_description.state_key, None)
+        return self._get_state(self.coordinator.data)
 
     async def async_turn_on(self, **kwargs: Any) -> None:  # noqa: ARG002
         """Turn on the switch."""
-        client = self.coordinator.client
-        method = getattr(client, self.entity_description.api_method)
-        await method(**{self.entity_description.api_param: True})
-        await self.coordinator.async_request_refresh()
+        await self._async_write(
+            self.entity_description.api_method,
+            {self.entity_description.api_param: True},
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:  # noqa: ARG002
         """Turn off the switch."""
-        client = self.coordinator.client
-        method = getattr(client, self.entity_description.api_method)
-        await method(**{self.entity_description.api_param: False})
-        await self.coordinator.async_request_refresh()
+        await self._async_write(
+            self.entity_description.api_method,
+            {self.entity_description.api_param: False},
+        )
@@ -0,0 +1,265 @@
+"""Websocket API streaming live OverSight device events."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+
+from .const import (
+    DATA_EVENTS,
+    DOMAIN,
+    EVENT_NOTIFICATION_DELIVERED,
+    EVENT_NOTIFICATION_FAILED,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import (
+        OversightDataUpdateCoordinator,
+        OversightLivenessCoordinator,
+    )
+    from .data import OversightConfigEntry
+
+# Events a subscriber may have waiting before further ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Queued events go out together at most this often per subscriber
+FLUSH_INTERVAL = 0.1
+
+
+@dataclass(slots=True)
+class _Subscriber:
+    """A websocket subscription and the events waiting to be sent to it."""
+
+    connection: websocket_api.ActiveConnection
+    msg_id: int
+    device_ids: set[str] | None
+    queue: asyncio.Queue[dict[str, Any]] = field(
+        default_factory=lambda: asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+    )
+    dropped: int = 0
+    task: asyncio.Task[None] | None = None
+
+    def wants(self, device_id: str) -> bool:
+        """Return true if the subscriber asked for events of a device."""
+        return self.device_ids is None or device_id in self.device_ids
+
+    def offer(self, event: dict[str, Any]) -> None:
+        """Queue an event, or count it as dropped if the queue is full."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+
+def _device_state(coordinator: OversightDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the state of a device as streamed to subscribers."""
+    state: dict[str, Any] = {"available": coordinator.last_update_success}
+    if coordinator.data is not None:
+        state.update(asdict(coordinator.data))
+    return state
+
+
+class OversightEventHub:
+    """
+    Fan device events out to websocket subscribers.
+
+    Every loaded entry feeds state changes, connectivity changes and delivery
+    outcomes into the hub. A new subscriber gets a snapshot of its devices in
+    one message, and a device that attaches later is announced with a full
+    snapshot of its own. Each subscriber has a bounded queue drained by its
+    own task. When a subscriber falls behind, new events are dropped and the
+    count is reported with its next batch, so that it can resubscribe for a
+    fresh snapshot. A slow client never holds up the event loop.
+
+    The hub lives as long as Home Assistant does. Subscriptions survive every
+    entry being unloaded, and pick the devices up again once they are back.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self._hass = hass
+        self._subscribers: set[_Subscriber] = set()
+        self._device_ids: dict[str, str] = {}
+        self._states: dict[str, dict[str, Any]] = {}
+        self._connected: dict[str, bool | None] = {}
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening for delivery outcomes."""
+        for event_type in (EVENT_NOTIFICATION_DELIVERED, EVENT_NOTIFICATION_FAILED):
+            self._hass.bus.async_listen(event_type, self._async_delivery)
+
+    @callback
+    def async_attach(self, entry: OversightConfigEntry) -> CALLBACK_TYPE:
+        """Feed the events of a loaded entry into the hub."""
+        entry_id = entry.entry_id
+        data = entry.runtime_data
+        self._device_ids[entry_id] = entry.unique_id or entry_id
+        self._states[entry_id] = _device_state(data.coordinator)
+        self._connected[entry_id] = data.liveness.data
+        # Subscribers know nothing of this device yet, e.g. after a reload
+        for event in self._snapshot(entry_id):
+            self._async_publish(entry_id, event)
+        unsubs = [
+            data.coordinator.async_add_listener(
+                partial(self._async_state_updated, entry_id, data.coordinator)
+            ),
+            data.liveness.async_add_listener(
+                partial(self._async_connectivity_updated, entry_id, data.liveness)
+            ),
+        ]
+
+        @callback
+        def detach() -> None:
+            for unsub in unsubs:
+                unsub()
+            self._async_publish(entry_id, {"type": "removed"})
+            del self._device_ids[entry_id]
+            del self._states[entry_id]
+            del self._connected[entry_id]
+
+        return detach
+
+    @callback
+    def async_subscribe(
+        self,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        device_ids: set[str] | None,
+    ) -> CALLBACK_TYPE:
+        """Add a subscriber, starting with a snapshot of its devices."""
+        subscriber = _Subscriber(connection, msg_id, device_ids)
+        # Sent directly, so that a large fleet does not overflow the queue
+        connection.send_message(
+            websocket_api.event_message(
+                msg_id,
+                {
+                    "events": [
+                        self._event(entry_id, event)
+                        for entry_id, device_id in self._device_ids.items()
+                        if subscriber.wants(device_id)
+                        for event in self._snapshot(entry_id)
+                    ]
+                },
+            )
+        )
+        subscriber.task = self._hass.async_create_background_task(
+            self._async_drain(subscriber),
+            name=f"{DOMAIN} websocket subscriber {msg_id}",
+        )
+        self._subscribers.add(subscriber)
+        return partial(self._async_unsubscribe, subscriber)
+
+    @callback
+    def _async_unsubscribe(self, subscriber: _Subscriber) -> None:
+        """Remove a subscriber."""
+        self._subscribers.discard(subscriber)
+        if subscriber.task is not None:
+            subscriber.task.cancel()
+
+    @callback
+    def _async_state_updated(
+        self, entry_id: str, coordinator: OversightDataUpdateCoordinator
+    ) -> None:
+        """Publish the fields of a device state that changed."""
+        state = _device_state(coordinator)
+        previous = self._states.get(entry_id, {})
+        changes = {
+            key: value for key, value in state.items() if previous.get(key) != value
+        }
+        if not changes:
+            return
+        self._states[entry_id] = state
+        self._async_publish(entry_id, {"type": "state", "state": changes})
+
+    @callback
+    def _async_connectivity_updated(
+        self, entry_id: str, liveness: OversightLivenessCoordinator
+    ) -> None:
+        """Publish a change in whether a device accepts connections."""
+        if liveness.data == self._connected.get(entry_id):
+            return
+        self._connected[entry_id] = liveness.data
+        self._async_publish(
+            entry_id, {"type": "connectivity", "connected": liveness.data}
+        )
+
+    @callback
+    def _async_delivery(self, event: Event[dict[str, Any]]) -> None:
+        """Publish the outcome of a delivery."""
+        record = dict(event.data)
+        entry_id = record.pop("entry_id")
+        if entry_id in self._device_ids:
+            self._async_publish(entry_id, {"type": "delivery", **record})
+
+    @callback
+    def _async_publish(self, entry_id: str, event: dict[str, Any]) -> None:
+        """Queue an event for every subscriber that wants it."""
+        if not self._subscribers:
+            return
+        device_id = self._device_ids[entry_id]
+        event = self._event(entry_id, event)
+        for subscriber in self._subscribers:
+            if subscriber.wants(device_id):
+                subscriber.offer(event)
+
+    def _snapshot(self, entry_id: str) -> list[dict[str, Any]]:
+        """Return the events that describe a device in full."""
+        return [
+            {"type": "state", "state": self._states[entry_id]},
+            {"type": "connectivity", "connected": self._connected[entry_id]},
+        ]
+
+    def _event(self, entry_id: str, event: dict[str, Any]) -> dict[str, Any]:
+        """Tag an event with the device it belongs to."""
+        return {"entry_id": entry_id, "device_id": self._device_ids[entry_id], **event}
+
+    async def _async_drain(self, subscriber: _Subscriber) -> None:
+        """Send queued events to a subscriber in batches."""
+        queue = subscriber.queue
+        while True:
+            events = [await queue.get()]
+            while not queue.empty():
+                events.append(queue.get_nowait())
+            message: dict[str, Any] = {"events": events}
+            if subscriber.dropped:
+                message["dropped"] = subscriber.dropped
+                subscriber.dropped = 0
+            subscriber.connection.send_message(
+                websocket_api.event_message(subscriber.msg_id, message)
+            )
+            await asyncio.sleep(FLUSH_INTERVAL)
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Optional("device_ids"): [str],
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream state, connectivity and delivery events of OverSight devices."""
+    hub: OversightEventHub = hass.data[DATA_EVENTS]
+    device_ids = msg.get("device_ids")
+    # The result goes first; the snapshot follows as the first event message
+    connection.send_result(msg["id"])
+    connection.subscriptions[msg["id"]] = hub.async_subscribe(
+        connection, msg["id"], set(device_ids) if device_ids is not None else None
+    )
@@ -0,0 +1,118 @@
+"""Ordered settings writes for a single OverSight Android TV device."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+from .api import OversightApiClientError
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from homeassistant.core import HomeAssistant
+
+    from .api import OversightApiClient
+    from .coordinator import OversightDataUpdateCoordinator
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    """Settings queued for one endpoint and the callers waiting on them."""
+
+    params: dict[str, Any] = field(default_factory=dict)
+    waiters: list[asyncio.Future[None]] = field(default_factory=list)
+
+
+class OversightSettingsWriter:
+    """
+    Send settings writes to a device one request at a time.
+
+    Writes queue up per endpoint, in the order the endpoints were first
+    written to. A newer value for a setting replaces one that has not been
+    sent yet, and a request on the wire always finishes before the next one
+    starts, so the device ends up with the last value written. The state is
+    refreshed once, after the queue has drained, and callers are released
+    only after that refresh, so entities already show what they wrote.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: OversightApiClient,
+        coordinator: OversightDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the writer."""
+        self._hass = hass
+        self._client = client
+        self._coordinator = coordinator
+        self._pending: dict[str, _PendingWrite] = {}
+        # Callers whose request has finished, with its error, until the refresh
+        self._sent: list[tuple[asyncio.Future[None], Exception | None]] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def async_write(self, method: str, params: dict[str, Any]) -> None:
+        """
+        Queue settings for a client method and wait until they are sent.
+
+        Returns once a request carrying these settings, or newer values for
+        them, has succeeded and the state has been refreshed. Raises the client
+        error if that request failed.
+        """
+        pending = self._pending.setdefault(method, _PendingWrite())
+        pending.params.update(params)
+        waiter: asyncio.Future[None] = self._hass.loop.create_future()
+        pending.waiters.append(waiter)
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_drain(),
+                name=f"{DOMAIN} settings writer {self._coordinator.name}",
+            )
+        await waiter
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop sending and release every waiting caller."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for pending in self._pending.values():
+            for waiter in pending.waiters:
+                waiter.cancel()
+        self._pending.clear()
+        for waiter, _ in self._sent:
+            waiter.cancel()
+        self._sent.clear()
+
+    async def _async_drain(self) -> None:
+        """Send queued writes until none are left, refresh, then release callers."""
+        try:
+            while self._pending:
+                while self._pending:
+                    method = next(iter(self._pending))
+                    pending = self._pending.pop(method)
+                    error: Exception | None = None
+                    try:
+                        await getattr(self._client, method)(**pending.params)
+                    except OversightApiClientError as exception:
+                        error = exception
+                    self._sent.extend((waiter, error) for waiter in pending.waiters)
+                # Writes queued during the refresh go out in another round
+                await self._coordinator.async_refresh()
+                self._release_sent()
+        finally:
+            self._task = None
+
+    def _release_sent(self) -> None:
+        """Release the callers whose requests have finished."""
+        for waiter, error in self._sent:
+            if waiter.done():
+                continue
+            if error is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(error)
+        self._sent.clear()
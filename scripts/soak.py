@@ -0,0 +1,579 @@
+"""
+Fleet soak test for the OverSight Android TV integration.
+
+Starts a throwaway Home Assistant instance, sets up one config entry per stub
+device and drives it for a fixed period while stubs add random latency and
+drop off the network. Writes a JSON report with event-loop lag, memory per
+device, state writes per minute, service-call latency, and the latency and
+request counts of badge bursts, which go out batched with --batch and one
+request per badge without.
+
+The stubs and their outages run in a process of their own, so the reported
+loop lag, latencies and memory are those of Home Assistant and the integration
+alone, not of serving the stubs.
+
+The integration is loaded from this checkout through a symlinked
+custom_components directory, so the Home Assistant version installed in the
+environment is the one being measured.
+"""
+# ruff: noqa: INP001
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+from homeassistant import bootstrap, runner
+from homeassistant.const import (
+    EVENT_STATE_CHANGED,
+    EVENT_STATE_REPORTED,
+    __version__,
+)
+from homeassistant.helpers import entity_registry as er
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
+
+    from homeassistant.core import Event, HomeAssistant
+
+DOMAIN = "oversight_android_tv_notifications"
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+LAG_INTERVAL = 0.1
+OUTAGE_CHECK_INTERVAL = 10.0
+
+
+@dataclass
+class StubDevice:
+    """A local HTTP server that answers like an OverSight device."""
+
+    index: int
+    rng: random.Random
+    latency: tuple[float, float]
+    batch: bool = False
+    port: int = 0
+    runner: web.AppRunner | None = None
+    site: web.TCPSite | None = None
+    online: bool = True
+    state: dict[str, Any] = field(default_factory=dict)
+    # Badge requests as received: one per badge, or batched
+    single_requests: int = 0
+    batch_requests: int = 0
+    batched_badges: int = 0
+
+    @property
+    def device_id(self) -> str:
+        """Return the device id reported by /info."""
+        return f"soak-{self.index:04d}"
+
+    async def async_start(self) -> None:
+        """Start serving on an ephemeral port."""
+        app = web.Application(middlewares=[self._latency_middleware])
+        app.router.add_get("/info", self._handle_info)
+        app.router.add_get("/fixed_notifications", self._handle_ok)
+        app.router.add_post("/notify_fixed/batch", self._handle_batch)
+        app.router.add_post("/notify_fixed", self._handle_fixed)
+        app.router.add_post("/{path:.*}", self._handle_ok)
+        self.state = {
+            "overlay": {"overlayVisibility": 0, "hotCorner": "top_end"},
+            "notifications": {"displayNotifications": True},
+            "settings": {"deviceName": f"Soak TV {self.index}"},
+        }
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        self.site = web.TCPSite(self.runner, "127.0.0.1", self.port)
+        await self.site.start()
+        self.port = self.runner.addresses[0][1]
+
+    async def async_stop(self) -> None:
+        """Stop the server."""
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    async def async_set_online(self, online: bool) -> None:  # noqa: FBT001
+        """Open or close the listening socket to simulate an outage."""
+        if online == self.online or self.runner is None:
+            return
+        self.online = online
+        if online:
+            self.site = web.TCPSite(
+                self.runner, "127.0.0.1", self.port, reuse_address=True
+            )
+            await self.site.start()
+        elif self.site is not None:
+            await self.site.stop()
+
+    @web.middleware
+    async def _latency_middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        """Delay every response by a random amount."""
+        await asyncio.sleep(self.rng.uniform(*self.latency))
+        return await handler(request)
+
+    async def _handle_info(self, _request: web.Request) -> web.Response:
+        """Answer /info."""
+        return web.json_response(
+            {
+                "success": True,
+                "result": {
+                    **self.state,
+                    "deviceId": self.device_id,
+                    "features": ["notify_fixed_batch"] if self.batch else [],
+                },
+            }
+        )
+
+    async def _handle_batch(self, request: web.Request) -> web.Response:
+        """Answer a batched badge request, or 404 like an older device."""
+        if not self.batch:
+            raise web.HTTPNotFound
+        body = await request.json()
+        self.batch_requests += 1
+        self.batched_badges += len(body["notifications"])
+        results = [{"success": True, "result": {}} for _ in body["notifications"]]
+        return web.json_response({"success": True, "result": {"results": results}})
+
+    async def _handle_fixed(self, _request: web.Request) -> web.Response:
+        """Acknowledge a single badge."""
+        self.single_requests += 1
+        return web.json_response({"success": True, "result": {}})
+
+    async def _handle_ok(self, _request: web.Request) -> web.Response:
+        """Acknowledge any write."""
+        return web.json_response({"success": True, "result": {}})
+
+
+def _rss_kib() -> int:
+    """Return the current resident set size in KiB."""
+    with contextlib.suppress(OSError):
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    # Peak RSS is the best portable fallback
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _percentiles(samples: list[float]) -> dict[str, float | None]:
+    """Summarize samples in milliseconds."""
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None, "max": None, "mean": None}
+    ordered = sorted(samples)
+
+    def pick(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2)
+
+    return {
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 2),
+        "mean": round(statistics.fmean(ordered), 2),
+    }
+
+
+async def _async_start_hass(config_dir: Path) -> HomeAssistant:
+    """Start a minimal Home Assistant instance in config_dir."""
+    (config_dir / "configuration.yaml").write_text(
+        "homeassistant:\n  name: Soak\nlogger:\n  default: warning\n"
+    )
+    (config_dir / "custom_components").symlink_to(REPO_ROOT / "custom_components")
+    hass = await bootstrap.async_setup_hass(
+        runner.RuntimeConfig(config_dir=str(config_dir), skip_pip=True)
+    )
+    if hass is None:
+        msg = "Home Assistant failed to start"
+        raise RuntimeError(msg)
+    await hass.async_start()
+    return hass
+
+
+async def _async_serve_stubs(conn: Connection, args: argparse.Namespace) -> None:
+    """
+    Serve the stub devices until told to stop.
+
+    Sends the stub ports once they listen, starts the outages when told to,
+    and answers the stop message with the badge request counts.
+    """
+    loop = asyncio.get_running_loop()
+    rng = random.Random(args.seed)  # noqa: S311
+    latency = (args.latency_min / 1000, args.latency_max / 1000)
+    devices = [
+        StubDevice(i, rng, latency, batch=args.batch) for i in range(args.devices)
+    ]
+    for device in devices:
+        await device.async_start()
+    try:
+        conn.send([device.port for device in devices])
+        # Devices stay up until Home Assistant has set every one of them up
+        await loop.run_in_executor(None, conn.recv)
+        stop = asyncio.Event()
+        flap = asyncio.create_task(
+            _async_flap(
+                stop,
+                devices,
+                rng,
+                args.outage_rate,
+                (args.outage_min, args.outage_max),
+            )
+        )
+        await loop.run_in_executor(None, conn.recv)
+        stop.set()
+        await flap
+        conn.send(
+            {
+                "single": sum(device.single_requests for device in devices),
+                "batch": sum(device.batch_requests for device in devices),
+                "batched_badges": sum(device.batched_badges for device in devices),
+            }
+        )
+    finally:
+        for device in devices:
+            await device.async_stop()
+
+
+def _serve_stubs(conn: Connection, args: argparse.Namespace) -> None:
+    """Run the stub devices in the child process."""
+    # The parent closing the pipe early, e.g. on a failed setup, ends the stubs
+    with contextlib.suppress(EOFError):
+        asyncio.run(_async_serve_stubs(conn, args))
+
+
+async def _async_start_stubs(
+    args: argparse.Namespace,
+) -> tuple[BaseProcess, Connection, list[int]]:
+    """Start the stub process and return it, its pipe and the stub ports."""
+    # Spawned, not forked, as this process already runs an event loop
+    context = multiprocessing.get_context("spawn")
+    conn, child_conn = context.Pipe()
+    stubs = context.Process(target=_serve_stubs, args=(child_conn, args), daemon=True)
+    stubs.start()
+    ports = await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+    return stubs, conn, ports
+
+
+async def _async_stop_stubs(stubs: BaseProcess, conn: Connection) -> None:
+    """Close the pipe to the stub process and wait for it to exit."""
+    conn.close()
+    await asyncio.get_running_loop().run_in_executor(None, stubs.join, 10)
+    if stubs.is_alive():
+        stubs.kill()
+
+
+async def _async_add_device(hass: HomeAssistant, index: int, port: int) -> None:
+    """Add a config entry for a stub through the user config flow."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "manual"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"host": "127.0.0.1", "port": port}
+    )
+    if result.get("type") != "create_entry":
+        msg = f"Could not add stub {index}: {result}"
+        raise RuntimeError(msg)
+
+
+async def _async_measure_lag(stop: asyncio.Event, samples: list[float]) -> None:
+    """Record how late a fixed-interval sleep wakes up."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + LAG_INTERVAL
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def _async_flap(
+    stop: asyncio.Event,
+    devices: list[StubDevice],
+    rng: random.Random,
+    outage_rate: float,
+    outage_length: tuple[float, float],
+) -> None:
+    """Take random stubs offline for a while."""
+    per_check = outage_rate * OUTAGE_CHECK_INTERVAL / 60
+
+    async def outage(device: StubDevice) -> None:
+        await device.async_set_online(False)  # noqa: FBT003
+        await asyncio.sleep(rng.uniform(*outage_length))
+        await device.async_set_online(True)  # noqa: FBT003
+
+    tasks: set[asyncio.Task[None]] = set()
+    while not stop.is_set():
+        for device in devices:
+            if device.online and rng.random() < per_check:
+                task = asyncio.create_task(outage(device))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(stop.wait(), OUTAGE_CHECK_INTERVAL)
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _async_call_services(  # noqa: PLR0913
+    hass: HomeAssistant,
+    stop: asyncio.Event,
+    targets: list[str],
+    rate: float,
+    latencies: list[float],
+    errors: list[str],
+) -> None:
+    """Send popups round-robin across devices at a fixed rate."""
+    tasks: set[asyncio.Task[None]] = set()
+
+    async def call(entity_id: str) -> None:
+        started = time.monotonic()
+        try:
+            await hass.services.async_call(
+                DOMAIN,
+                "send_notification",
+                {"entity_id": entity_id, "message": "soak"},
+                blocking=True,
+            )
+        except Exception as exception:  # noqa: BLE001
+            errors.append(type(exception).__name__)
+        else:
+            latencies.append((time.monotonic() - started) * 1000)
+
+    index = 0
+    while not stop.is_set() and targets:
+        task = asyncio.create_task(call(targets[index % len(targets)]))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        index += 1
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(stop.wait(), 1 / rate)
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _async_burst_badges(  # noqa: PLR0913
+    hass: HomeAssistant,
+    stop: asyncio.Event,
+    targets: list[str],
+    rate: float,
+    size: int,
+    latencies: list[float],
+    errors: list[str],
+) -> None:
+    """Send bursts of badges to one device at a time, round-robin."""
+    tasks: set[asyncio.Task[None]] = set()
+
+    async def burst(entity_id: str, tick: int) -> None:
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(
+                hass.services.async_call(
+                    DOMAIN,
+                    "send_fixed_notification",
+                    {"entity_id": entity_id, "id": f"soak-{n}", "text": str(tick)},
+                    blocking=True,
+                )
+                for n in range(size)
+            ),
+            return_exceptions=True,
+        )
+        failed = [r for r in results if isinstance(r, BaseException)]
+        errors.extend(type(exception).__name__ for exception in failed)
+        if not failed:
+            latencies.append((time.monotonic() - started) * 1000)
+
+    index = 0
+    while not stop.is_set() and targets and size:
+        task = asyncio.create_task(burst(targets[index % len(targets)], index))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        index += 1
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(stop.wait(), 1 / rate)
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def async_soak(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the soak test and return the report."""
+    loop = asyncio.get_running_loop()
+    stubs, conn, ports = await _async_start_stubs(args)
+
+    config_dir = Path(tempfile.mkdtemp(prefix="oversight-soak-"))
+    hass = await _async_start_hass(config_dir)
+    try:
+        await hass.async_block_till_done()
+        rss_before = _rss_kib()
+        setup_started = time.monotonic()
+        for index, port in enumerate(ports):
+            await _async_add_device(hass, index, port)
+        await hass.async_block_till_done()
+        setup_seconds = time.monotonic() - setup_started
+        rss_after = _rss_kib()
+
+        ent_reg = er.async_get(hass)
+        our_entities = {
+            entry.entity_id
+            for entry in ent_reg.entities.values()
+            if entry.platform == DOMAIN
+        }
+        notify_targets = sorted(e for e in our_entities if e.startswith("notify."))
+
+        writes = {"changed": 0, "reported": 0}
+
+        def count(kind: str) -> Any:
+            def listener(event: Event) -> None:
+                if event.data.get("entity_id") in our_entities:
+                    writes[kind] += 1
+
+            return listener
+
+        unsubs = [
+            hass.bus.async_listen(EVENT_STATE_CHANGED, count("changed")),
+            hass.bus.async_listen(EVENT_STATE_REPORTED, count("reported")),
+        ]
+
+        stop = asyncio.Event()
+        lag: list[float] = []
+        latencies: list[float] = []
+        errors: list[str] = []
+        burst_latencies: list[float] = []
+        burst_errors: list[str] = []
+        workers = [
+            asyncio.create_task(_async_measure_lag(stop, lag)),
+            asyncio.create_task(
+                _async_call_services(
+                    hass, stop, notify_targets, args.call_rate, latencies, errors
+                )
+            ),
+            asyncio.create_task(
+                _async_burst_badges(
+                    hass,
+                    stop,
+                    notify_targets,
+                    args.burst_rate,
+                    args.burst_size,
+                    burst_latencies,
+                    burst_errors,
+                )
+            ),
+        ]
+        conn.send("flap")
+        started = time.monotonic()
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*workers)
+        elapsed = time.monotonic() - started
+        conn.send("stop")
+        badge_requests: dict[str, int] = await loop.run_in_executor(None, conn.recv)
+        for unsub in unsubs:
+            unsub()
+        rss_end = _rss_kib()
+    finally:
+        await hass.async_stop()
+        await _async_stop_stubs(stubs, conn)
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+    minutes = elapsed / 60
+    return {
+        "ha_version": __version__,
+        "config": {
+            "devices": args.devices,
+            "duration_s": args.duration,
+            "latency_ms": [args.latency_min, args.latency_max],
+            "outage_rate_per_device_per_min": args.outage_rate,
+            "outage_s": [args.outage_min, args.outage_max],
+            "call_rate_per_s": args.call_rate,
+            "burst_rate_per_s": args.burst_rate,
+            "burst_size": args.burst_size,
+            "batch": args.batch,
+            "seed": args.seed,
+        },
+        "setup_s": round(setup_seconds, 2),
+        "entities": len(our_entities),
+        "loop_lag_ms": _percentiles(lag),
+        "memory_kib": {
+            "before_setup": rss_before,
+            "after_setup": rss_after,
+            "end": rss_end,
+            "per_device": round((rss_after - rss_before) / max(1, args.devices), 1),
+            "growth_during_soak": rss_end - rss_after,
+        },
+        "state_writes_per_min": {
+            "changed": round(writes["changed"] / minutes, 1),
+            "reported": round(writes["reported"] / minutes, 1),
+        },
+        "service_calls": {
+            "completed": len(latencies),
+            "failed": len(errors),
+            "errors": {name: errors.count(name) for name in set(errors)},
+            "latency_ms": _percentiles(latencies),
+        },
+        "badge_bursts": {
+            "completed": len(burst_latencies),
+            "failed_badges": len(burst_errors),
+            "errors": {name: burst_errors.count(name) for name in set(burst_errors)},
+            "latency_ms": _percentiles(burst_latencies),
+            "requests": badge_requests,
+        },
+    }
+
+
+def main() -> int:
+    """Parse arguments, run the soak test and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--devices", type=int, default=150)
+    parser.add_argument("--duration", type=float, default=600, help="seconds")
+    parser.add_argument("--latency-min", type=float, default=5, help="ms")
+    parser.add_argument("--latency-max", type=float, default=150, help="ms")
+    parser.add_argument(
+        "--outage-rate",
+        type=float,
+        default=0.05,
+        help="outages per device per minute",
+    )
+    parser.add_argument("--outage-min", type=float, default=5, help="seconds")
+    parser.add_argument("--outage-max", type=float, default=60, help="seconds")
+    parser.add_argument(
+        "--call-rate", type=float, default=2, help="send_notification calls/s"
+    )
+    parser.add_argument("--burst-rate", type=float, default=0.5, help="badge bursts/s")
+    parser.add_argument(
+        "--burst-size",
+        type=int,
+        default=8,
+        help="send_fixed_notification calls per burst, 0 to send no badges",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="stubs advertise and accept batched badge requests",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=Path, help="write the JSON report here instead of stdout"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(async_soak(args))
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())